@@ -19,14 +19,31 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"mysql+pymysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
 
+    # 构建异步数据库URL
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"mysql+aiomysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
+
+    # 异步连接池配置
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
     # JWT配置
     SECRET_KEY: str = os.getenv("SECRET_KEY", "")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7天
+    LOGIN_CHALLENGE_EXPIRE_SECONDS: int = int(
+        os.getenv("LOGIN_CHALLENGE_EXPIRE_SECONDS", "300")
+    )
+    # 已验证JWT缓存的最大条目数
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", "10000"))
 
     # EVM 配置
     EVM_RPC_URL: str = os.getenv("EVM_RPC_URL", "")
     POLKADOT_RPC_URL: str = os.getenv("POLKADOT_RPC_URL", "")
+    # WebSocket地址，配置后通过newHeads订阅新区块；为空时使用自适应轮询
+    EVM_WS_URL: str = os.getenv("EVM_WS_URL", "")
+    POLKADOT_WS_URL: str = os.getenv("POLKADOT_WS_URL", "")
     NFT_CONTRACT_ADDRESS: str = os.getenv("NFT_CONTRACT_ADDRESS", "")
     POLKADOT_NFT_CONTRACT_ADDRESS: str = os.getenv("POLKADOT_NFT_CONTRACT_ADDRESS", "")
     LAUNCHPAD_CONTRACT_ADDRESS: str = os.getenv("LAUNCHPAD_CONTRACT_ADDRESS", "")
@@ -34,9 +51,102 @@ class Settings(BaseSettings):
         "POLKADOT_LAUNCHPAD_CONTRACT_ADDRESS", ""
     )
     PRIVATE_KEY: str = os.getenv("PRIVATE_KEY", "")
+    # 异步链客户端共享的RPC连接池
+    RPC_MAX_CONNECTIONS: int = int(os.getenv("RPC_MAX_CONNECTIONS", "20"))
+    RPC_REQUEST_TIMEOUT: float = float(os.getenv("RPC_REQUEST_TIMEOUT", "30"))
+
+    # 交易提交配置
+    # 非阻塞模式下setPrice发送后立即返回，由后台回执跟踪器确认
+    TX_NONBLOCKING_SUBMIT: bool = (
+        os.getenv("TX_NONBLOCKING_SUBMIT", "true").lower() == "true"
+    )
+    TX_RECEIPT_POLL_INTERVAL: float = float(os.getenv("TX_RECEIPT_POLL_INTERVAL", "3"))
+    TX_RECEIPT_TIMEOUT: float = float(os.getenv("TX_RECEIPT_TIMEOUT", "120"))
+    # setPrice失败后在之后的窗口中重新提交的最大次数
+    TX_PRICE_MAX_RETRIES: int = int(os.getenv("TX_PRICE_MAX_RETRIES", "3"))
+
+    # 事件处理流水线配置
+    EVENT_WORKER_COUNT: int = int(os.getenv("EVENT_WORKER_COUNT", "8"))
+    EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+
+    # 区块追赶配置：落后超过一个窗口时按固定窗口分段回填
+    LISTENER_BACKFILL_WINDOW: int = int(os.getenv("LISTENER_BACKFILL_WINDOW", "2000"))
+    LISTENER_BACKFILL_CONCURRENCY: int = int(
+        os.getenv("LISTENER_BACKFILL_CONCURRENCY", "4")
+    )
+    # 自适应轮询间隔：有事件时使用最短间隔，空闲时逐次翻倍到最长间隔
+    HEAD_POLL_MIN_INTERVAL: float = float(os.getenv("HEAD_POLL_MIN_INTERVAL", "2"))
+    HEAD_POLL_MAX_INTERVAL: float = float(os.getenv("HEAD_POLL_MAX_INTERVAL", "30"))
+    # 确认深度：只处理到最新区块减去该深度的区块
+    EVM_CONFIRMATIONS: int = int(os.getenv("EVM_CONFIRMATIONS", "2"))
+    POLKADOT_CONFIRMATIONS: int = int(os.getenv("POLKADOT_CONFIRMATIONS", "2"))
+    # 内存中保留的最近已处理窗口数（末尾区块哈希与回滚日志），用于发现并回滚区块重组
+    REORG_RING_SIZE: int = int(os.getenv("REORG_RING_SIZE", "64"))
+    # 每条INSERT ... ON DUPLICATE KEY UPDATE写入的Minted事件数量上限
+    MINT_INGEST_BATCH_SIZE: int = int(os.getenv("MINT_INGEST_BATCH_SIZE", "500"))
+
+    # 领导者选举配置：多进程部署时只有领导者进程运行事件监听器
+    # 可选 mysql（GET_LOCK，可跨主机）、file（flock，仅限单机）、none（不选举）
+    LEADER_ELECTION_BACKEND: str = os.getenv("LEADER_ELECTION_BACKEND", "mysql")
+    LEADER_LOCK_NAME: str = os.getenv("LEADER_LOCK_NAME", "mooncl_listener_leader")
+    LEADER_LOCK_FILE: str = os.getenv("LEADER_LOCK_FILE", "/tmp/mooncl_listener.lock")
+    LEADER_ELECTION_INTERVAL: float = float(
+        os.getenv("LEADER_ELECTION_INTERVAL", "10")
+    )
+
+    # get_logs自适应拉取配置
+    LOG_FETCH_INITIAL_SPAN: int = int(os.getenv("LOG_FETCH_INITIAL_SPAN", "1000"))
+    LOG_FETCH_MAX_SPAN: int = int(os.getenv("LOG_FETCH_MAX_SPAN", "10000"))
+    LOG_FETCH_SPARSE_THRESHOLD: int = int(
+        os.getenv("LOG_FETCH_SPARSE_THRESHOLD", "100")
+    )
+    # 节点限流时的重试次数与指数退避（秒）
+    LOG_FETCH_RATE_LIMIT_RETRIES: int = int(
+        os.getenv("LOG_FETCH_RATE_LIMIT_RETRIES", "5")
+    )
+    LOG_FETCH_BACKOFF_BASE: float = float(os.getenv("LOG_FETCH_BACKOFF_BASE", "1"))
+    LOG_FETCH_BACKOFF_MAX: float = float(os.getenv("LOG_FETCH_BACKOFF_MAX", "30"))
 
     # AI评估配置
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    PRICING_API_MAX_CONNECTIONS: int = int(
+        os.getenv("PRICING_API_MAX_CONNECTIONS", "20")
+    )
+    PRICING_API_KEEPALIVE_TIMEOUT: float = float(
+        os.getenv("PRICING_API_KEEPALIVE_TIMEOUT", "30")
+    )
+    PRICING_API_CONNECT_TIMEOUT: float = float(
+        os.getenv("PRICING_API_CONNECT_TIMEOUT", "5")
+    )
+    PRICING_API_READ_TIMEOUT: float = float(os.getenv("PRICING_API_READ_TIMEOUT", "30"))
+
+    # 估价微批处理配置；配置了批量接口地址时合并为一次批量请求
+    PRICING_API_BATCH_URL: str = os.getenv("PRICING_API_BATCH_URL", "")
+    PRICING_BATCH_MAX_SIZE: int = int(os.getenv("PRICING_BATCH_MAX_SIZE", "16"))
+    PRICING_BATCH_MAX_WAIT_MS: float = float(
+        os.getenv("PRICING_BATCH_MAX_WAIT_MS", "10")
+    )
+    PRICING_FANOUT_LIMIT: int = int(os.getenv("PRICING_FANOUT_LIMIT", "8"))
+
+    # 估价缓存配置：模型版本变化后旧缓存自动失效
+    PRICING_MODEL_VERSION: str = os.getenv("PRICING_MODEL_VERSION", "v1")
+    EVALUATION_CACHE_SIZE: int = int(os.getenv("EVALUATION_CACHE_SIZE", "10000"))
+    EVALUATION_CACHE_TTL: int = int(
+        os.getenv("EVALUATION_CACHE_TTL", str(7 * 24 * 3600))
+    )
+
+    # 价格排行榜配置
+    LEADERBOARD_SIZE: int = int(os.getenv("LEADERBOARD_SIZE", "200"))
+    LEADERBOARD_REFRESH_INTERVAL: float = float(
+        os.getenv("LEADERBOARD_REFRESH_INTERVAL", "60")
+    )
+
+    # 实时推送配置：每个客户端的缓冲区满时丢弃最旧的事件
+    FEED_POLL_INTERVAL: float = float(os.getenv("FEED_POLL_INTERVAL", "1"))
+    FEED_CLIENT_BUFFER_SIZE: int = int(os.getenv("FEED_CLIENT_BUFFER_SIZE", "100"))
+    FEED_RELAY_BATCH_SIZE: int = int(os.getenv("FEED_RELAY_BATCH_SIZE", "500"))
+    FEED_RETENTION_SECONDS: int = int(os.getenv("FEED_RETENTION_SECONDS", "3600"))
+    FEED_HEARTBEAT_INTERVAL: float = float(os.getenv("FEED_HEARTBEAT_INTERVAL", "15"))
 
     class Config:
         env_file = ".env"
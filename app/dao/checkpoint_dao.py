@@ -0,0 +1,96 @@
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import BlockCheckpointDB
+from typing import List, Optional
+
+
+class CheckpointConflictError(Exception):
+    """检查点已被其他进程推进，本次写入需要回滚"""
+
+
+class CheckpointDAO:
+    @staticmethod
+    def get_last_block(db: Session, chain: str, contract_address: str) -> Optional[int]:
+        """获取指定链、合约已处理的最后区块"""
+        checkpoint = (
+            db.query(BlockCheckpointDB)
+            .filter(
+                BlockCheckpointDB.chain == chain,
+                BlockCheckpointDB.contract_address == contract_address,
+            )
+            .first()
+        )
+        return checkpoint.last_block if checkpoint else None
+
+    @staticmethod
+    def save(
+        db: Session, chain: str, contract_addresses: List[str], last_block: int
+    ) -> None:
+        """在同一事务中保存指定链上多个合约已处理的最后区块"""
+        for contract_address in contract_addresses:
+            db.merge(
+                BlockCheckpointDB(
+                    chain=chain,
+                    contract_address=contract_address,
+                    last_block=last_block,
+                )
+            )
+        db.commit()
+
+
+class AsyncCheckpointDAO:
+    @staticmethod
+    async def get_last_block(
+        db: AsyncSession, chain: str, contract_address: str
+    ) -> Optional[int]:
+        """获取指定链、合约已处理的最后区块"""
+        result = await db.execute(
+            select(BlockCheckpointDB.last_block).where(
+                BlockCheckpointDB.chain == chain,
+                BlockCheckpointDB.contract_address == contract_address,
+            )
+        )
+        return result.scalar()
+
+    @staticmethod
+    async def save(
+        db: AsyncSession, chain: str, contract_addresses: List[str], last_block: int
+    ) -> None:
+        """在同一事务中保存指定链上多个合约已处理的最后区块"""
+        for contract_address in contract_addresses:
+            await db.merge(
+                BlockCheckpointDB(
+                    chain=chain,
+                    contract_address=contract_address,
+                    last_block=last_block,
+                )
+            )
+        await db.commit()
+
+    @staticmethod
+    async def compare_and_set(
+        db: AsyncSession,
+        chain: str,
+        contract_addresses: List[str],
+        expected_block: int,
+        last_block: int,
+    ) -> None:
+        """
+        仅当所有合约的检查点仍为expected_block时更新为last_block（不提交事务）
+        - 其他进程已推进检查点时抛出CheckpointConflictError，由调用方回滚同一事务中的写入
+        """
+        addresses = list(dict.fromkeys(contract_addresses))
+        result = await db.execute(
+            update(BlockCheckpointDB)
+            .where(
+                BlockCheckpointDB.chain == chain,
+                BlockCheckpointDB.contract_address.in_(addresses),
+                BlockCheckpointDB.last_block == expected_block,
+            )
+            .values(last_block=last_block)
+        )
+        if result.rowcount != len(addresses):
+            raise CheckpointConflictError(
+                f"[{chain}] checkpoint moved away from block {expected_block}"
+            )
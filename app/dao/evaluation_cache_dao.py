@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Session
+from app.models import EvaluationCacheDB
+from datetime import datetime
+from typing import Optional
+
+
+class EvaluationCacheDAO:
+    @staticmethod
+    def get(
+        db: Session, content_hash: str, model_version: str
+    ) -> Optional[EvaluationCacheDB]:
+        """获取未过期的估价缓存"""
+        return (
+            db.query(EvaluationCacheDB)
+            .filter(
+                EvaluationCacheDB.content_hash == content_hash,
+                EvaluationCacheDB.model_version == model_version,
+                EvaluationCacheDB.expires_at > datetime.utcnow(),
+            )
+            .first()
+        )
+
+    @staticmethod
+    def save(
+        db: Session,
+        content_hash: str,
+        model_version: str,
+        price: float,
+        expires_at: datetime,
+    ) -> None:
+        """写入或覆盖估价缓存"""
+        db.merge(
+            EvaluationCacheDB(
+                content_hash=content_hash,
+                model_version=model_version,
+                price=price,
+                expires_at=expires_at,
+            )
+        )
+        db.commit()
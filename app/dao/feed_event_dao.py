@@ -0,0 +1,43 @@
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import FeedEventDB
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+class AsyncFeedEventDAO:
+    @staticmethod
+    async def add_many(db: AsyncSession, events: List[Dict[str, Any]]) -> None:
+        """批量写入推送事件"""
+        if not events:
+            return
+        await db.execute(insert(FeedEventDB), events)
+        await db.commit()
+
+    @staticmethod
+    async def get_last_id(db: AsyncSession) -> int:
+        """获取最新事件ID，没有事件时返回0"""
+        result = await db.execute(select(func.max(FeedEventDB.id)))
+        return result.scalar() or 0
+
+    @staticmethod
+    async def get_after(
+        db: AsyncSession, last_id: int, limit: int
+    ) -> List[FeedEventDB]:
+        """按ID升序获取last_id之后的事件"""
+        result = await db.execute(
+            select(FeedEventDB)
+            .where(FeedEventDB.id > last_id)
+            .order_by(FeedEventDB.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def delete_before(db: AsyncSession, cutoff: datetime) -> int:
+        """删除cutoff之前的事件，返回删除的行数"""
+        result = await db.execute(
+            delete(FeedEventDB).where(FeedEventDB.created_at < cutoff)
+        )
+        await db.commit()
+        return result.rowcount
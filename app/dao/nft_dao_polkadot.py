@@ -1,7 +1,14 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, desc, func, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from app.models import NFTPolkadotDB
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+
+
+# 批量按主键查询时每条IN语句包含的最大token_id数量
+IN_QUERY_CHUNK_SIZE = 200
 
 
 class NFTPolkadotDAO:
@@ -76,3 +83,220 @@ class NFTPolkadotDAO:
         )
         db.commit()
         return result > 0
+
+
+class AsyncNFTPolkadotDAO:
+    @staticmethod
+    def _list_columns(fields: Sequence[str], preview: Optional[int] = None) -> List:
+        """按需选择列；指定预览长度时在SQL中截断content"""
+        columns = []
+        for field in fields:
+            if field == "content" and preview is not None:
+                columns.append(
+                    func.substr(NFTPolkadotDB.content, 1, preview).label("content")
+                )
+            else:
+                columns.append(getattr(NFTPolkadotDB, field))
+        return columns
+
+    @staticmethod
+    def _owner_page(
+        query, owner_address: str, limit: int, cursor: Optional[Tuple[datetime, Any]]
+    ):
+        """为查询附加所有者过滤、键集分页条件与排序"""
+        query = query.where(NFTPolkadotDB.owner_address == owner_address)
+        if cursor is not None:
+            # 键集分页：沿复合索引直接定位，深页与首页开销相同
+            created_at, token_id = cursor
+            query = query.where(
+                or_(
+                    NFTPolkadotDB.created_at < created_at,
+                    and_(
+                        NFTPolkadotDB.created_at == created_at,
+                        NFTPolkadotDB.token_id < token_id,
+                    ),
+                )
+            )
+        return query.order_by(
+            desc(NFTPolkadotDB.created_at), desc(NFTPolkadotDB.token_id)
+        ).limit(limit)
+
+    @staticmethod
+    async def create(db: AsyncSession, nft_data: Dict[str, Any]) -> NFTPolkadotDB:
+        """创建新Polkadot链上NFT"""
+        db_nft = NFTPolkadotDB(**nft_data)
+        db.add(db_nft)
+        await db.commit()
+        await db.refresh(db_nft)
+        return db_nft
+
+    @staticmethod
+    async def bulk_upsert_minted(
+        db: AsyncSession, nfts: List[Dict[str, Any]]
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        在一个事务中幂等写入一批Minted事件对应的NFT
+        - 先以FOR UPDATE锁定并查询已存在的记录，避免并发写入之间的竞争
+        - 再用一条INSERT ... ON DUPLICATE KEY UPDATE写入，已存在的记录保持不变
+
+        Returns:
+            (需要估价的token_id, 本次新插入的token_id)；需要估价的包括本次新插入的，
+            以及此前已插入但尚未估价的
+        """
+        if not nfts:
+            return [], []
+
+        # token_id列为字符串，统一转换后再写入和比较
+        nfts = [{**nft, "token_id": str(nft["token_id"])} for nft in nfts]
+        token_ids = list(dict.fromkeys(nft["token_id"] for nft in nfts))
+        try:
+            evaluated = {}
+            for start in range(0, len(token_ids), IN_QUERY_CHUNK_SIZE):
+                chunk = token_ids[start : start + IN_QUERY_CHUNK_SIZE]
+                result = await db.execute(
+                    select(NFTPolkadotDB.token_id, NFTPolkadotDB.evaluate_price)
+                    .where(NFTPolkadotDB.token_id.in_(chunk))
+                    .with_for_update()
+                )
+                evaluated.update(result.tuples().all())
+
+            stmt = mysql_insert(NFTPolkadotDB).values(nfts)
+            await db.execute(
+                stmt.on_duplicate_key_update(token_id=stmt.inserted.token_id)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        pending = [
+            token_id for token_id in token_ids if evaluated.get(token_id) is None
+        ]
+        inserted = [token_id for token_id in token_ids if token_id not in evaluated]
+        return pending, inserted
+
+    @staticmethod
+    async def get_by_token_id(
+        db: AsyncSession, token_id: int
+    ) -> Optional[NFTPolkadotDB]:
+        """根据token_id获取NFT"""
+        result = await db.execute(
+            select(NFTPolkadotDB).where(NFTPolkadotDB.token_id == str(token_id))
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_by_token_ids(
+        db: AsyncSession, token_ids: Sequence[int]
+    ) -> List[NFTPolkadotDB]:
+        """根据多个token_id批量获取NFT，按IN_QUERY_CHUNK_SIZE分块查询"""
+        unique_ids = list(dict.fromkeys([str(token_id) for token_id in token_ids]))
+        nfts = []
+        for start in range(0, len(unique_ids), IN_QUERY_CHUNK_SIZE):
+            chunk = unique_ids[start : start + IN_QUERY_CHUNK_SIZE]
+            result = await db.execute(
+                select(NFTPolkadotDB).where(NFTPolkadotDB.token_id.in_(chunk))
+            )
+            nfts.extend(result.scalars().all())
+        return nfts
+
+    @staticmethod
+    async def get_by_owner(
+        db: AsyncSession,
+        owner_address: str,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, Any]] = None,
+    ) -> List[NFTPolkadotDB]:
+        """
+        通过所有者地址获取NFT列表（按创建时间倒序）
+
+        Args:
+            cursor: 上一页最后一条记录的(created_at, token_id)，为空时从第一页开始
+        """
+        result = await db.execute(
+            AsyncNFTPolkadotDAO._owner_page(
+                select(NFTPolkadotDB), owner_address, limit, cursor
+            )
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_ranking_by_price(
+        db: AsyncSession, limit: int = 20
+    ) -> List[NFTPolkadotDB]:
+        """获取NFT排行榜（按价格排序）"""
+        result = await db.execute(
+            select(NFTPolkadotDB)
+            .order_by(desc(NFTPolkadotDB.current_price))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_by_owner_projected(
+        db: AsyncSession,
+        owner_address: str,
+        fields: Sequence[str],
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, Any]] = None,
+        preview: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """只查询指定字段的用户NFT列表，额外返回分页所需的created_at与token_id"""
+        keys = [field for field in ("created_at", "token_id") if field not in fields]
+        query = select(*AsyncNFTPolkadotDAO._list_columns([*fields, *keys], preview))
+        result = await db.execute(
+            AsyncNFTPolkadotDAO._owner_page(query, owner_address, limit, cursor)
+        )
+        return [dict(row) for row in result.mappings().all()]
+
+    @staticmethod
+    async def get_ranking_projected(
+        db: AsyncSession,
+        fields: Sequence[str],
+        limit: int = 20,
+        preview: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """只查询指定字段的NFT排行榜"""
+        result = await db.execute(
+            select(*AsyncNFTPolkadotDAO._list_columns(fields, preview))
+            .order_by(desc(NFTPolkadotDB.current_price))
+            .limit(limit)
+        )
+        return [dict(row) for row in result.mappings().all()]
+
+    @staticmethod
+    async def update_owner(db: AsyncSession, token_id: int, new_owner: str) -> bool:
+        """更新NFT所有者"""
+        result = await db.execute(
+            update(NFTPolkadotDB)
+            .where(NFTPolkadotDB.token_id == token_id)
+            .values(owner_address=new_owner)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def update_evaluate_price(
+        db: AsyncSession, token_id: int, price: float
+    ) -> bool:
+        """更新NFT评估价格"""
+        result = await db.execute(
+            update(NFTPolkadotDB)
+            .where(NFTPolkadotDB.token_id == token_id)
+            .values(evaluate_price=price)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def update_current_price(
+        db: AsyncSession, token_id: int, price: float
+    ) -> bool:
+        """更新NFT当前价格"""
+        result = await db.execute(
+            update(NFTPolkadotDB)
+            .where(NFTPolkadotDB.token_id == token_id)
+            .values(current_price=price)
+        )
+        await db.commit()
+        return result.rowcount > 0
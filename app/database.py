@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.config import settings
 
 # 创建MySQL引擎
@@ -14,6 +15,21 @@ engine = create_engine(
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 创建异步MySQL引擎，供HTTP路由和事件监听器使用
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,  # 自动重连
+    pool_recycle=300,  # 连接池回收时间
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    echo=False,  # 设置为True可以看到SQL语句
+)
+
+# 创建异步会话工厂
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # 创建基础模型类
 Base = declarative_base()
 
@@ -27,6 +43,12 @@ def get_db():
         db.close()
 
 
+# 异步数据库依赖函数
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # 创建所有表
 def create_tables():
     Base.metadata.create_all(bind=engine)
@@ -7,10 +7,11 @@ from sqlalchemy import (
     Text,
     DECIMAL,
     BigInteger,
+    Index,
 )
 from sqlalchemy.sql import func
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 from app.database import Base
 
@@ -23,10 +24,15 @@ class NFTDB(Base):
     owner_address = Column(String(255), nullable=False, index=True)
     content = Column(Text, nullable=False)
     evaluate_price = Column(DECIMAL(20, 8), nullable=True)
-    current_price = Column(DECIMAL(20, 8), nullable=True)
+    current_price = Column(DECIMAL(20, 8), nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
 
+    # 按所有者分页查询使用的复合索引
+    __table_args__ = (
+        Index("idx_owner_created_token", "owner_address", "created_at", "token_id"),
+    )
+
 
 # SQLAlchemy ORM 模型
 class NFTPolkadotDB(Base):
@@ -36,10 +42,50 @@ class NFTPolkadotDB(Base):
     owner_address = Column(String(255), nullable=False, index=True)
     content = Column(Text, nullable=False)
     evaluate_price = Column(DECIMAL(20, 12), nullable=True)
-    current_price = Column(DECIMAL(20, 12), nullable=True)
+    current_price = Column(DECIMAL(20, 12), nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
 
+    # 按所有者分页查询使用的复合索引
+    __table_args__ = (
+        Index("idx_owner_created_token", "owner_address", "created_at", "token_id"),
+    )
+
+
+# 区块监听进度（每条链、每个合约一条记录）
+class BlockCheckpointDB(Base):
+    __tablename__ = "block_checkpoint"
+
+    chain = Column(String(64), primary_key=True)
+    contract_address = Column(String(255), primary_key=True)
+    last_block = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+# 内容估价缓存（按规范化内容哈希与估价模型版本区分）
+class EvaluationCacheDB(Base):
+    __tablename__ = "evaluation_cache"
+
+    content_hash = Column(String(64), primary_key=True)
+    model_version = Column(String(64), primary_key=True)
+    price = Column(DECIMAL(20, 8), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+# 实时推送事件（领导者进程写入，各进程轮询后推送给本进程的订阅者）
+class FeedEventDB(Base):
+    __tablename__ = "nft_feed_event"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    chain = Column(String(64), nullable=False)
+    event_type = Column(String(32), nullable=False)
+    token_id = Column(String(255), nullable=False)
+    owner_address = Column(String(255), nullable=False)
+    previous_owner = Column(String(255), nullable=True)
+    current_price = Column(DECIMAL(20, 12), nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+
 
 # Pydantic 模型
 class NFTResponse(BaseModel):
@@ -95,6 +141,29 @@ class NFTPolkadotListResponse(BaseModel):
         from_attributes = True
 
 
+# 批量查询NFT详情时单次请求的最大token_id数量
+MAX_BATCH_TOKEN_IDS = 500
+
+
+# 批量查询NFT详情请求
+class NFTBatchDetailRequest(BaseModel):
+    token_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_TOKEN_IDS)
+
+
+# 批量查询NFT详情的单项结果，按请求顺序返回
+class NFTBatchDetailItem(BaseModel):
+    token_id: int
+    found: bool
+    nft: Optional[NFTResponse] = None
+
+
+# 批量查询Polkadot链上NFT详情的单项结果，按请求顺序返回
+class NFTPolkadotBatchDetailItem(BaseModel):
+    token_id: str
+    found: bool
+    nft: Optional[NFTPolkadotResponse] = None
+
+
 # 统一的多链NFT响应模型
 class MultiChainNFTResponse(BaseModel):
     chain_type: str
@@ -109,3 +178,16 @@ class MultiChainNFTResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# 实时推送事件：minted（新铸造）、bought（所有者变更）、price（链上价格已确认）、
+# reverted（区块重组后恢复到之前的状态）、removed（区块重组后铸造被撤销）
+class NFTFeedEvent(BaseModel):
+    id: int
+    chain_type: str
+    event_type: str
+    token_id: str
+    owner_address: str
+    previous_owner: Optional[str] = None
+    current_price: Optional[float] = None
+    created_at: datetime
@@ -1,19 +1,17 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
-from typing import Union, Dict, Any
+from typing import Union
 from app.utils.jwt_auth import (
     generate_challenge,
+    verify_challenge,
+    consume_challenge,
     verify_sui_signature,
     generate_jwt,
-    verify_jwt,
-    authenticate,
 )
 
 
 router = APIRouter()
 
-login_challenges: Dict[str, str] = {}
-
 
 class LoginRequest(BaseModel):
     address: Union[str, bytes]
@@ -44,10 +42,9 @@ async def login(request: LoginRequest):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Address is required."
         )
 
-    # 生成一个随机挑战
-    challenge = generate_challenge()
+    # 生成带签名的挑战，服务端无需保存，任意进程都可以校验
     address_key = address if isinstance(address, str) else address.hex()
-    login_challenges[address_key] = challenge
+    challenge = generate_challenge(address_key)
 
     if isinstance(address, bytes):
         hex_address = "0x" + address.hex()
@@ -75,9 +72,10 @@ async def login_signature(request: LoginSignatureRequest):
             detail="Address and challenge are required.",
         )
 
-    # 验证挑战是否匹配
+    # 验证挑战的签名、地址与有效期
     address_key = address if isinstance(address, str) else address.hex()
-    if login_challenges.get(address_key) != challenge:
+    claims = verify_challenge(challenge, address_key)
+    if not claims:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Challenge mismatch. Please initiate login again.",
@@ -91,11 +89,12 @@ async def login_signature(request: LoginSignatureRequest):
         # user = await UserService.get_user(address)
         # user_state = await UserService.get_daily_state(address)
 
+        # 挑战只能使用一次
+        if not consume_challenge(claims):
+            raise Exception("Challenge already used. Please initiate login again.")
+
         # 签名通过，生成JWT
         token = generate_jwt({"address": address_key})
-
-        # 清除挑战
-        del login_challenges[address_key]
         return LoginResponse(success=True, token=token)
 
     except Exception as error:
@@ -0,0 +1,103 @@
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.utils.chain_registry import chain_registry
+from app.utils.live_feed import FeedSubscription, live_feed
+from typing import Optional, Set
+import asyncio
+
+router = APIRouter()
+
+
+def _parse_chains(chain: Optional[str]) -> Optional[Set[str]]:
+    """解析逗号分隔的链过滤条件"""
+    if not chain:
+        return None
+    chains = {c.strip().lower() for c in chain.split(",") if c.strip()}
+    unknown = chains - set(chain_registry)
+    if unknown:
+        raise ValueError(f"Unknown chain: {', '.join(sorted(unknown))}")
+    return chains or None
+
+
+async def _send_events(websocket: WebSocket, subscription: FeedSubscription):
+    while True:
+        _, payload = await subscription.get()
+        await websocket.send_text(payload)
+
+
+async def _wait_disconnect(websocket: WebSocket):
+    # 客户端不需要发送消息，读取只用于及时发现断开
+    while True:
+        await websocket.receive_text()
+
+
+@router.websocket("/ws")
+async def feed_websocket(
+    websocket: WebSocket,
+    chain: Optional[str] = Query(None, description="链过滤，逗号分隔：evm,polkadot"),
+    owner: Optional[str] = Query(None, description="所有者地址过滤"),
+):
+    """通过WebSocket推送NFT铸造、购买与价格变化事件"""
+    try:
+        chains = _parse_chains(chain)
+    except ValueError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    await websocket.accept()
+    subscription = live_feed.subscribe(chains, owner)
+    tasks = [
+        asyncio.create_task(_send_events(websocket, subscription)),
+        asyncio.create_task(_wait_disconnect(websocket)),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        live_feed.unsubscribe(subscription)
+
+
+@router.get("/sse")
+async def feed_sse(
+    request: Request,
+    chain: Optional[str] = Query(None, description="链过滤，逗号分隔：evm,polkadot"),
+    owner: Optional[str] = Query(None, description="所有者地址过滤"),
+):
+    """通过Server-Sent Events推送NFT铸造、购买与价格变化事件"""
+    try:
+        chains = _parse_chains(chain)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    subscription = live_feed.subscribe(chains, owner)
+
+    async def stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event, payload = await asyncio.wait_for(
+                        subscription.get(), settings.FEED_HEARTBEAT_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    # 心跳，避免代理关闭空闲连接
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event.id}\nevent: {event.event_type}\ndata: {payload}\n\n"
+        finally:
+            live_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
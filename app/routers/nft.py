@@ -1,22 +1,58 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
-from sqlalchemy.orm import Session
-from app.models import NFTResponse, NFTListResponse
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import (
+    NFTResponse,
+    NFTListResponse,
+    NFTBatchDetailItem,
+    NFTBatchDetailRequest,
+)
 from app.services.nft_service import NFTService
-from app.database import get_db
-from typing import List
+from app.database import get_async_db
+from app.utils.leaderboard import nft_leaderboard
+from app.utils.projection import parse_fields
+from typing import List, Optional
 
 
 router = APIRouter()
 
 
+def _parse_fields(fields: Optional[str]):
+    """解析fields参数，包含未知字段时返回400"""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/ranking", response_model=List[NFTListResponse])
-def get_nft_ranking(
+async def get_nft_ranking(
     limit: int = Query(20, description="返回数量限制"),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="逗号分隔的返回字段"),
+    preview: Optional[int] = Query(None, ge=0, description="content预览长度"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """获取NFT排行榜（按价格排序）"""
+    if fields is not None or preview is not None:
+        field_list = _parse_fields(fields)
+        try:
+            items = await NFTService.get_nft_ranking_projected(
+                db, field_list, limit, preview
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to get NFT ranking: {str(e)}",
+            )
+        return JSONResponse(content=items)
+
+    # limit在排行榜容量内时直接返回内存中缓存的响应体
+    body = await nft_leaderboard.get_body(limit)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
     try:
-        return NFTService.get_nft_ranking(db, limit)
+        return await NFTService.get_nft_ranking(db, limit)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -25,9 +61,9 @@ def get_nft_ranking(
 
 
 @router.get("/detail/{token_id}", response_model=NFTResponse)
-def get_nft_detail(token_id: int, db: Session = Depends(get_db)):
+async def get_nft_detail(token_id: int, db: AsyncSession = Depends(get_async_db)):
     """获取NFT详情"""
-    nft = NFTService.get_nft_by_token_id(db, token_id)
+    nft = await NFTService.get_nft_by_token_id(db, token_id)
     if not nft:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="NFT not found"
@@ -35,13 +71,54 @@ def get_nft_detail(token_id: int, db: Session = Depends(get_db)):
     return nft
 
 
+@router.post("/detail/batch", response_model=List[NFTBatchDetailItem])
+async def get_nft_details_batch(
+    request: NFTBatchDetailRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """批量获取NFT详情（按请求顺序返回）"""
+    try:
+        return await NFTService.get_nfts_by_token_ids(db, request.token_ids)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get NFT details: {str(e)}",
+        )
+
+
 @router.get("/user/{user_address}", response_model=List[NFTListResponse])
-def get_user_nfts(user_address: str, db: Session = Depends(get_db)):
+async def get_user_nfts(
+    user_address: str,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标"),
+    fields: Optional[str] = Query(None, description="逗号分隔的返回字段"),
+    preview: Optional[int] = Query(None, ge=0, description="content预览长度"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """获取用户NFT列表"""
+    # 指定了字段或预览长度时只查询需要的列，直接返回字典
+    sparse = fields is not None or preview is not None
+    field_list = _parse_fields(fields) if sparse else None
     try:
-        return NFTService.get_nfts_by_owner(db, user_address)
+        if sparse:
+            nfts, next_cursor = await NFTService.get_nfts_by_owner_projected(
+                db, user_address, field_list, limit, cursor, preview
+            )
+        else:
+            nfts, next_cursor = await NFTService.get_nfts_by_owner(
+                db, user_address, limit, cursor
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get user NFTs: {str(e)}",
         )
+
+    # 还有下一页时通过响应头返回游标，响应体结构保持不变
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if sparse:
+        return JSONResponse(content=nfts, headers=headers)
+    response.headers.update(headers)
+    return nfts
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, status, Query
+from app.models import MultiChainNFTResponse
+from app.services.nft_service_multichain import MultiChainNFTService
+from typing import List
+
+router = APIRouter()
+
+
+@router.get("/ranking", response_model=List[MultiChainNFTResponse])
+async def get_multichain_nft_ranking(
+    limit: int = Query(20, ge=0, description="返回数量限制"),
+):
+    """获取跨链NFT排行榜（按价格排序）"""
+    try:
+        return await MultiChainNFTService.get_nft_ranking(limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get NFT ranking: {str(e)}",
+        )
+
+
+@router.get("/user/{user_address}", response_model=List[MultiChainNFTResponse])
+async def get_multichain_user_nfts(
+    user_address: str,
+    limit: int = Query(100, ge=1, le=500, description="返回数量限制"),
+):
+    """获取用户在所有链上的NFT列表（按创建时间倒序）"""
+    try:
+        return await MultiChainNFTService.get_nfts_by_owner(user_address, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get user NFTs: {str(e)}",
+        )
@@ -1,17 +1,15 @@
-from sqlalchemy.orm import Session
-from app.dao.nft_dao import NFTDAO
-from app.models import NFTResponse, NFTListResponse
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dao.nft_dao import AsyncNFTDAO
+from app.models import NFTResponse, NFTListResponse, NFTBatchDetailItem
+from app.utils.leaderboard import nft_leaderboard
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.projection import project_row
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 class NFTService:
     @staticmethod
-    def get_nft_by_token_id(db: Session, token_id: int) -> Optional[NFTResponse]:
-        """获取NFT详情"""
-        db_nft = NFTDAO.get_by_token_id(db, token_id)
-        if not db_nft:
-            return None
-
+    def _to_response(db_nft) -> NFTResponse:
         return NFTResponse(
             token_id=db_nft.token_id,
             owner_address=db_nft.owner_address,
@@ -25,9 +23,56 @@ class NFTService:
         )
 
     @staticmethod
-    def get_nfts_by_owner(db: Session, owner_address: str) -> List[NFTListResponse]:
-        """获取用户的所有NFT"""
-        db_nfts = NFTDAO.get_by_owner(db, owner_address)
+    async def get_nft_by_token_id(
+        db: AsyncSession, token_id: int
+    ) -> Optional[NFTResponse]:
+        """获取NFT详情"""
+        db_nft = await AsyncNFTDAO.get_by_token_id(db, token_id)
+        if not db_nft:
+            return None
+
+        return NFTService._to_response(db_nft)
+
+    @staticmethod
+    async def get_nfts_by_token_ids(
+        db: AsyncSession, token_ids: List[int]
+    ) -> List[NFTBatchDetailItem]:
+        """批量获取NFT详情，按请求顺序返回并标记不存在的token_id"""
+        db_nfts = await AsyncNFTDAO.get_by_token_ids(db, token_ids)
+        # token_id列为varchar，读出的值是字符串，两侧统一按字符串匹配
+        found = {str(nft.token_id): NFTService._to_response(nft) for nft in db_nfts}
+        results = []
+        for token_id in token_ids:
+            nft = found.get(str(token_id))
+            results.append(
+                NFTBatchDetailItem(token_id=token_id, found=nft is not None, nft=nft)
+            )
+        return results
+
+    @staticmethod
+    async def get_nfts_by_owner(
+        db: AsyncSession,
+        owner_address: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[NFTListResponse], Optional[str]]:
+        """
+        获取用户的NFT（按创建时间倒序分页）
+
+        Returns:
+            (本页NFT列表, 下一页游标)；没有更多数据时游标为None
+        """
+        db_nfts = await AsyncNFTDAO.get_by_owner(
+            db,
+            owner_address,
+            limit,
+            decode_cursor(cursor) if cursor else None,
+        )
+        next_cursor = None
+        if len(db_nfts) == limit:
+            last = db_nfts[-1]
+            next_cursor = encode_cursor(last.created_at, last.token_id)
+
         return [
             NFTListResponse(
                 token_id=nft.token_id,
@@ -40,12 +85,14 @@ class NFTService:
                 created_at=nft.created_at,
             )
             for nft in db_nfts
-        ]
+        ], next_cursor
 
     @staticmethod
-    def get_nft_ranking(db: Session, limit: int = 20) -> List[NFTListResponse]:
+    async def get_nft_ranking(
+        db: AsyncSession, limit: int = 20
+    ) -> List[NFTListResponse]:
         """获取NFT排行榜（按价格排序）"""
-        db_nfts = NFTDAO.get_ranking_by_price(db, limit)
+        db_nfts = await AsyncNFTDAO.get_ranking_by_price(db, limit)
         return [
             NFTListResponse(
                 token_id=nft.token_id,
@@ -61,9 +108,53 @@ class NFTService:
         ]
 
     @staticmethod
-    def transfer_nft(db: Session, token_id: int, to_address: str, from_address: str):
+    async def get_nfts_by_owner_projected(
+        db: AsyncSession,
+        owner_address: str,
+        fields: Sequence[str],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        preview: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """获取用户NFT列表的指定字段，返回可直接序列化的字典"""
+        rows = await AsyncNFTDAO.get_by_owner_projected(
+            db,
+            owner_address,
+            fields,
+            limit,
+            decode_cursor(cursor) if cursor else None,
+            preview,
+        )
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["token_id"])
+
+        items = [project_row(row, fields, model=NFTResponse) for row in rows]
+        return items, next_cursor
+
+    @staticmethod
+    async def get_nft_ranking_projected(
+        db: AsyncSession,
+        fields: Sequence[str],
+        limit: int = 20,
+        preview: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """获取NFT排行榜的指定字段，优先由内存排行榜返回"""
+        items = await nft_leaderboard.get_items(limit)
+        if items is not None:
+            return [
+                project_row(vars(item), fields, preview, NFTResponse) for item in items
+            ]
+
+        rows = await AsyncNFTDAO.get_ranking_projected(db, fields, limit, preview)
+        return [project_row(row, fields, model=NFTResponse) for row in rows]
+
+    @staticmethod
+    async def transfer_nft(
+        db: AsyncSession, token_id: int, to_address: str, from_address: str
+    ):
         """转移NFT"""
-        db_nft = NFTDAO.get_by_token_id(db, token_id)
+        db_nft = await AsyncNFTDAO.get_by_token_id(db, token_id)
         if not db_nft:
             raise ValueError("NFT not found")
 
@@ -71,15 +162,19 @@ class NFTService:
             raise ValueError("Not the owner of this NFT")
 
         # 更新owner_address
-        NFTDAO.update_owner(db, token_id, to_address)
+        await AsyncNFTDAO.update_owner(db, token_id, to_address)
         return {"success": True, "message": "NFT transferred successfully"}
 
     @staticmethod
-    def update_evaluate_price(db: Session, token_id: int, price: float) -> bool:
+    async def update_evaluate_price(
+        db: AsyncSession, token_id: int, price: float
+    ) -> bool:
         """更新NFT评估价格"""
-        return NFTDAO.update_evaluate_price(db, token_id, price)
+        return await AsyncNFTDAO.update_evaluate_price(db, token_id, price)
 
     @staticmethod
-    def update_current_price(db: Session, token_id: int, price: float) -> bool:
+    async def update_current_price(
+        db: AsyncSession, token_id: int, price: float
+    ) -> bool:
         """更新NFT当前价格"""
-        return NFTDAO.update_current_price(db, token_id, price)
+        return await AsyncNFTDAO.update_current_price(db, token_id, price)
@@ -0,0 +1,76 @@
+import asyncio
+import heapq
+from itertools import islice
+from typing import Any, Iterable, List
+from app.database import AsyncSessionLocal
+from app.models import MultiChainNFTResponse
+from app.utils.chain_registry import get_chains
+
+
+def _price_key(item: MultiChainNFTResponse):
+    """与数据库ORDER BY current_price DESC一致：价格降序，空价格排在最后"""
+    return (item.current_price is None, -(item.current_price or 0))
+
+
+class MultiChainNFTService:
+    @staticmethod
+    def _to_response(chain_type: str, nft: Any) -> MultiChainNFTResponse:
+        return MultiChainNFTResponse(
+            chain_type=chain_type,
+            token_id=str(nft.token_id),
+            owner_address=nft.owner_address,
+            content=nft.content,
+            evaluate_price=float(nft.evaluate_price) if nft.evaluate_price else None,
+            current_price=float(nft.current_price) if nft.current_price else None,
+            created_at=nft.created_at,
+        )
+
+    @staticmethod
+    async def _chain_ranking(
+        chain_type: str, dao: Any, leaderboard: Any, limit: int
+    ) -> List[MultiChainNFTResponse]:
+        """获取单条链的排行榜，优先由内存排行榜返回"""
+        nfts: Iterable[Any] = await leaderboard.get_items(limit)
+        if nfts is None:
+            # 每条链使用独立会话，两条链的查询可以并发执行
+            async with AsyncSessionLocal() as db:
+                nfts = await dao.get_ranking_by_price(db, limit)
+        return [MultiChainNFTService._to_response(chain_type, nft) for nft in nfts]
+
+    @staticmethod
+    async def _chain_owner_nfts(
+        chain_type: str, dao: Any, owner_address: str, limit: int
+    ) -> List[MultiChainNFTResponse]:
+        """获取用户在单条链上的NFT（按创建时间倒序）"""
+        async with AsyncSessionLocal() as db:
+            nfts = await dao.get_by_owner(db, owner_address, limit)
+        return [MultiChainNFTService._to_response(chain_type, nft) for nft in nfts]
+
+    @staticmethod
+    async def get_nft_ranking(limit: int = 20) -> List[MultiChainNFTResponse]:
+        """获取跨链NFT排行榜：并发查询各链的前limit名，再按价格多路归并"""
+        rankings = await asyncio.gather(
+            *(
+                MultiChainNFTService._chain_ranking(
+                    chain.name, chain.dao, chain.leaderboard, limit
+                )
+                for chain in get_chains()
+            )
+        )
+        return list(islice(heapq.merge(*rankings, key=_price_key), limit))
+
+    @staticmethod
+    async def get_nfts_by_owner(
+        owner_address: str, limit: int = 100
+    ) -> List[MultiChainNFTResponse]:
+        """获取用户在所有链上的NFT：并发查询各链，再按创建时间倒序归并"""
+        results = await asyncio.gather(
+            *(
+                MultiChainNFTService._chain_owner_nfts(
+                    chain.name, chain.dao, owner_address, limit
+                )
+                for chain in get_chains()
+            )
+        )
+        merged = heapq.merge(*results, key=lambda item: item.created_at, reverse=True)
+        return list(islice(merged, limit))
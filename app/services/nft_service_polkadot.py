@@ -1,22 +1,19 @@
-from sqlalchemy.orm import Session
-from app.dao.nft_dao_polkadot import NFTPolkadotDAO
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dao.nft_dao_polkadot import AsyncNFTPolkadotDAO
 from app.models import (
     NFTPolkadotResponse,
+    NFTPolkadotBatchDetailItem,
     NFTPolkadotListResponse,
 )
-from typing import List, Optional
+from app.utils.leaderboard import nft_polkadot_leaderboard
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.projection import project_row
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 class NFTPolkadotService:
     @staticmethod
-    def get_nft_by_token_id(
-        db: Session, token_id: int
-    ) -> Optional[NFTPolkadotResponse]:
-        """获取Polkadot链上NFT详情"""
-        db_nft = NFTPolkadotDAO.get_by_token_id(db, token_id)
-        if not db_nft:
-            return None
-
+    def _to_response(db_nft) -> NFTPolkadotResponse:
         return NFTPolkadotResponse(
             token_id=db_nft.token_id,
             owner_address=db_nft.owner_address,
@@ -30,11 +27,57 @@ class NFTPolkadotService:
         )
 
     @staticmethod
-    def get_nfts_by_owner(
-        db: Session, owner_address: str
-    ) -> List[NFTPolkadotListResponse]:
-        """获取用户的所有Polkadot链上NFT"""
-        db_nfts = NFTPolkadotDAO.get_by_owner(db, owner_address)
+    async def get_nft_by_token_id(
+        db: AsyncSession, token_id: int
+    ) -> Optional[NFTPolkadotResponse]:
+        """获取Polkadot链上NFT详情"""
+        db_nft = await AsyncNFTPolkadotDAO.get_by_token_id(db, token_id)
+        if not db_nft:
+            return None
+
+        return NFTPolkadotService._to_response(db_nft)
+
+    @staticmethod
+    async def get_nfts_by_token_ids(
+        db: AsyncSession, token_ids: List[int]
+    ) -> List[NFTPolkadotBatchDetailItem]:
+        """批量获取NFT详情，按请求顺序返回并标记不存在的token_id"""
+        db_nfts = await AsyncNFTPolkadotDAO.get_by_token_ids(db, token_ids)
+        found = {nft.token_id: NFTPolkadotService._to_response(nft) for nft in db_nfts}
+        results = []
+        for token_id in map(str, token_ids):
+            nft = found.get(token_id)
+            results.append(
+                NFTPolkadotBatchDetailItem(
+                    token_id=token_id, found=nft is not None, nft=nft
+                )
+            )
+        return results
+
+    @staticmethod
+    async def get_nfts_by_owner(
+        db: AsyncSession,
+        owner_address: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[NFTPolkadotListResponse], Optional[str]]:
+        """
+        获取用户的Polkadot链上NFT（按创建时间倒序分页）
+
+        Returns:
+            (本页NFT列表, 下一页游标)；没有更多数据时游标为None
+        """
+        db_nfts = await AsyncNFTPolkadotDAO.get_by_owner(
+            db,
+            owner_address,
+            limit,
+            decode_cursor(cursor) if cursor else None,
+        )
+        next_cursor = None
+        if len(db_nfts) == limit:
+            last = db_nfts[-1]
+            next_cursor = encode_cursor(last.created_at, last.token_id)
+
         return [
             NFTPolkadotListResponse(
                 token_id=nft.token_id,
@@ -47,12 +90,14 @@ class NFTPolkadotService:
                 created_at=nft.created_at,
             )
             for nft in db_nfts
-        ]
+        ], next_cursor
 
     @staticmethod
-    def get_nft_ranking(db: Session, limit: int = 20) -> List[NFTPolkadotListResponse]:
+    async def get_nft_ranking(
+        db: AsyncSession, limit: int = 20
+    ) -> List[NFTPolkadotListResponse]:
         """获取Polkadot链上NFT排行榜（按价格排序）"""
-        db_nfts = NFTPolkadotDAO.get_ranking_by_price(db, limit)
+        db_nfts = await AsyncNFTPolkadotDAO.get_ranking_by_price(db, limit)
         return [
             NFTPolkadotListResponse(
                 token_id=nft.token_id,
@@ -68,9 +113,56 @@ class NFTPolkadotService:
         ]
 
     @staticmethod
-    def transfer_nft(db: Session, token_id: int, to_address: str, from_address: str):
+    async def get_nfts_by_owner_projected(
+        db: AsyncSession,
+        owner_address: str,
+        fields: Sequence[str],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        preview: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """获取用户NFT列表的指定字段，返回可直接序列化的字典"""
+        rows = await AsyncNFTPolkadotDAO.get_by_owner_projected(
+            db,
+            owner_address,
+            fields,
+            limit,
+            decode_cursor(cursor) if cursor else None,
+            preview,
+        )
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["token_id"])
+
+        items = [project_row(row, fields, model=NFTPolkadotResponse) for row in rows]
+        return items, next_cursor
+
+    @staticmethod
+    async def get_nft_ranking_projected(
+        db: AsyncSession,
+        fields: Sequence[str],
+        limit: int = 20,
+        preview: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """获取NFT排行榜的指定字段，优先由内存排行榜返回"""
+        items = await nft_polkadot_leaderboard.get_items(limit)
+        if items is not None:
+            return [
+                project_row(vars(item), fields, preview, NFTPolkadotResponse)
+                for item in items
+            ]
+
+        rows = await AsyncNFTPolkadotDAO.get_ranking_projected(
+            db, fields, limit, preview
+        )
+        return [project_row(row, fields, model=NFTPolkadotResponse) for row in rows]
+
+    @staticmethod
+    async def transfer_nft(
+        db: AsyncSession, token_id: int, to_address: str, from_address: str
+    ):
         """转移Polkadot链上NFT"""
-        db_nft = NFTPolkadotDAO.get_by_token_id(db, token_id)
+        db_nft = await AsyncNFTPolkadotDAO.get_by_token_id(db, token_id)
         if not db_nft:
             raise ValueError("NFT not found")
 
@@ -78,15 +170,19 @@ class NFTPolkadotService:
             raise ValueError("Not the owner of this NFT")
 
         # 更新owner_address
-        NFTDAO.update_owner(db, token_id, to_address)
+        await AsyncNFTPolkadotDAO.update_owner(db, token_id, to_address)
         return {"success": True, "message": "NFT transferred successfully"}
 
     @staticmethod
-    def update_evaluate_price(db: Session, token_id: int, price: float) -> bool:
+    async def update_evaluate_price(
+        db: AsyncSession, token_id: int, price: float
+    ) -> bool:
         """更新Polkadot链上NFT评估价格"""
-        return NFTPolkadotDAO.update_evaluate_price(db, token_id, price)
+        return await AsyncNFTPolkadotDAO.update_evaluate_price(db, token_id, price)
 
     @staticmethod
-    def update_current_price(db: Session, token_id: int, price: float) -> bool:
+    async def update_current_price(
+        db: AsyncSession, token_id: int, price: float
+    ) -> bool:
         """更新Polkadot链上NFT当前价格"""
-        return NFTPolkadotDAO.update_current_price(db, token_id, price)
+        return await AsyncNFTPolkadotDAO.update_current_price(db, token_id, price)
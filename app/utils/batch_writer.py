@@ -0,0 +1,233 @@
+import logging
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.dao.checkpoint_dao import AsyncCheckpointDAO
+from app.dao.nft_dao import IN_QUERY_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# 每次购买后价格上涨15%
+PURCHASE_PRICE_MULTIPLIER = Decimal("1.15")
+
+
+class WindowJournal:
+    """
+    一个区块窗口的回滚日志，用于区块重组后撤销该窗口的数据库写入。
+    - 记录本窗口新插入的token，回滚时删除
+    - 记录其他被修改的记录在本窗口首次修改前的状态，回滚时恢复
+    - token_id列为varchar，所有条件都以字符串绑定，才能使用主键索引
+    """
+
+    def __init__(self, model: Any):
+        self.model = model
+        # str(token_id) -> token_id
+        self.inserted: Dict[str, Any] = {}
+        # str(token_id) -> 修改前的状态
+        self.before: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def token_ids(self) -> List[Any]:
+        """本窗口内写入过的token_id"""
+        return list(self.inserted.values()) + [
+            state["token_id"] for state in self.before.values()
+        ]
+
+    def record_inserted(self, token_ids: Iterable[Any]):
+        for token_id in token_ids:
+            self.inserted.setdefault(str(token_id), token_id)
+
+    def record_before(self, states: Iterable[Dict[str, Any]]):
+        """只保留每个token第一次被修改前的状态"""
+        for state in states:
+            key = str(state["token_id"])
+            if key not in self.inserted and key not in self.before:
+                self.before[key] = state
+
+    async def revert(self, connection: AsyncConnection):
+        """撤销本窗口的写入（不提交事务）"""
+        model = self.model
+        inserted = list(self.inserted)
+        for start in range(0, len(inserted), IN_QUERY_CHUNK_SIZE):
+            chunk = inserted[start : start + IN_QUERY_CHUNK_SIZE]
+            await connection.execute(delete(model).where(model.token_id.in_(chunk)))
+
+        if self.before:
+            await connection.execute(
+                update(model)
+                .where(model.token_id == bindparam("b_token_id"))
+                .values(
+                    owner_address=bindparam("b_owner_address"),
+                    evaluate_price=bindparam("b_evaluate_price"),
+                    current_price=bindparam("b_current_price"),
+                ),
+                [
+                    {
+                        **{f"b_{column}": value for column, value in state.items()},
+                        "b_token_id": key,
+                    }
+                    for key, state in self.before.items()
+                ],
+            )
+
+
+async def select_states(
+    connection: AsyncConnection, model: Any, token_ids: List[Any]
+) -> List[Dict[str, Any]]:
+    """查询记录当前的所有者与价格，用于回滚日志"""
+    states = []
+    keys = list(dict.fromkeys(str(token_id) for token_id in token_ids))
+    for start in range(0, len(keys), IN_QUERY_CHUNK_SIZE):
+        chunk = keys[start : start + IN_QUERY_CHUNK_SIZE]
+        result = await connection.execute(
+            select(
+                model.token_id,
+                model.owner_address,
+                model.evaluate_price,
+                model.current_price,
+            ).where(model.token_id.in_(chunk))
+        )
+        states.extend(dict(row) for row in result.mappings())
+    return states
+
+
+async def revert_windows(db: AsyncSession, journals: List[WindowJournal]):
+    """
+    按从新到旧的顺序回滚多个窗口（不提交事务，由调用方与检查点一起提交）
+
+    Args:
+        journals: 要回滚的窗口日志，按处理顺序排列
+    """
+    connection = await db.connection()
+    for journal in reversed(journals):
+        await journal.revert(connection)
+
+
+class WindowWriter:
+    """
+    一个区块窗口内的数据库写入单元。
+    - 事件处理时只记录写操作，窗口结束时与检查点在同一个事务中统一执行，
+      窗口重放时不会重复执行已提交的写入
+    - 新铸造NFT的初始估价先通过一次批量UPDATE写入，再按记录顺序批量执行Bought的UPDATE
+    - 购买后的价格上涨在SQL中原子计算，不需要先查询当前价格
+    """
+
+    def __init__(self, model: Any, dao: Any, journal: Optional[WindowJournal] = None):
+        self.model = model
+        self.dao = dao
+        self.journal = journal
+        self._initial_prices: List[Tuple[Any, float, float]] = []
+        self._purchases: List[Tuple[Any, str]] = []
+        # str(token_id) -> token_id，用于写入后查询最终状态
+        self._touched: Dict[str, Any] = {}
+        # str(token_id) -> 本窗口写入前的所有者，flush后用于购买事件中的卖方
+        self.previous_owners: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._initial_prices) + len(self._purchases)
+
+    @property
+    def minted_token_ids(self) -> List[Any]:
+        """本窗口内写入初始估价的token_id（去重，保持顺序）"""
+        return list(dict.fromkeys(token_id for token_id, _, _ in self._initial_prices))
+
+    @property
+    def purchased_token_ids(self) -> List[Any]:
+        """本窗口内发生购买的token_id（去重，保持顺序）"""
+        return list(dict.fromkeys(token_id for token_id, _ in self._purchases))
+
+    def set_initial_price(self, token_id: Any, price: float, current_price: float):
+        """记录新铸造NFT的评估价格，以及附加gas费用后的当前价格"""
+        self._initial_prices.append((token_id, price, current_price))
+        self._touched[str(token_id)] = token_id
+
+    def add_purchase(self, token_id: Any, buyer: str):
+        """记录一次购买：更新所有者并将当前价格上涨15%"""
+        self._purchases.append((token_id, buyer))
+        self._touched[str(token_id)] = token_id
+
+    async def flush(
+        self,
+        db: AsyncSession,
+        chain: str,
+        contract_addresses: List[str],
+        previous_block: int,
+        last_block: int,
+    ) -> Dict[str, Any]:
+        """
+        在一个事务中执行本窗口记录的所有写操作并保存检查点
+
+        Args:
+            chain, contract_addresses: 检查点所属的链与合约
+            previous_block: 本窗口开始前的检查点，检查点已不是该值时整个事务回滚，
+                防止两个进程同时索引时重复执行同一窗口
+            last_block: 本窗口处理完成后的检查点
+
+        Returns:
+            str(token_id) -> 写入后的NFT记录，不包含数据库中不存在的token
+        """
+        model = self.model
+        rows = {}
+        try:
+            # 通过Connection执行多参数UPDATE，绕开ORM按主键批量更新的模式
+            connection = await db.connection()
+            states = []
+            if self._touched:
+                states = await select_states(
+                    connection, model, list(self._touched.values())
+                )
+            self.previous_owners = {
+                str(state["token_id"]): state["owner_address"] for state in states
+            }
+            if self.journal is not None:
+                # 记录写入前的状态，区块重组时用于回滚
+                self.journal.record_before(states)
+
+            if self._initial_prices:
+                await connection.execute(
+                    update(model)
+                    .where(model.token_id == bindparam("b_token_id"))
+                    .values(
+                        evaluate_price=bindparam("b_price"),
+                        current_price=bindparam("b_current_price"),
+                    ),
+                    [
+                        {
+                            "b_token_id": str(token_id),
+                            "b_price": price,
+                            "b_current_price": current_price,
+                        }
+                        for token_id, price, current_price in self._initial_prices
+                    ],
+                )
+
+            if self._purchases:
+                await connection.execute(
+                    update(model)
+                    .where(model.token_id == bindparam("b_token_id"))
+                    .values(
+                        owner_address=bindparam("b_buyer"),
+                        current_price=model.current_price * PURCHASE_PRICE_MULTIPLIER,
+                    ),
+                    [
+                        {"b_token_id": str(token_id), "b_buyer": buyer}
+                        for token_id, buyer in self._purchases
+                    ],
+                )
+
+            if self._touched:
+                nfts = await self.dao.get_by_token_ids(db, list(self._touched.values()))
+                rows = {str(nft.token_id): nft for nft in nfts}
+            await AsyncCheckpointDAO.compare_and_set(
+                db, chain, contract_addresses, previous_block, last_block
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        for token_id, _ in self._purchases:
+            if str(token_id) not in rows:
+                logger.warning(f"NFT with token_id {token_id} not found in database")
+        return rows
@@ -0,0 +1,173 @@
+"""
+批量重新估价工具
+
+使用传统算法（calculate_price_traditional）重新计算整表NFT的评估价格：
+    python -m app.utils.bulk_reprice --table all --chunk-size 5000
+"""
+
+import argparse
+import time
+from typing import List, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select, update
+from app.database import SessionLocal
+from app.models import NFTDB, NFTPolkadotDB
+
+TABLES = {
+    "nft": NFTDB,
+    "nft_polkadot": NFTPolkadotDB,
+}
+
+# Unicode码位空间大小
+CODE_POINT_RANGE = 0x110000
+
+# 使用(行, 字符)布尔矩阵统计去重字符数的最大元素数，超过时改用排序去重
+UNIQUE_MATRIX_LIMIT = 50_000_000
+
+
+def calculate_prices_traditional(contents: Sequence[str]) -> np.ndarray:
+    """
+    向量化版本的传统算法估价，结果与calculate_price_traditional逐项一致
+
+    Args:
+        contents: 要评估的内容列表
+
+    Returns:
+        与contents一一对应的价格数组
+    """
+    count = len(contents)
+    if count == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    lengths = np.fromiter((len(c) for c in contents), dtype=np.int64, count=count)
+
+    # 将整批文本展开为码位数组，并记录每个字符所属的行
+    codes = np.frombuffer(
+        "".join(contents).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+    )
+    rows = np.repeat(np.arange(count, dtype=np.int64), lengths)
+
+    # 将码位映射为整批中不同字符的下标（查表，无需排序）
+    present = np.zeros(CODE_POINT_RANGE, dtype=bool)
+    present[codes] = True
+    distinct_codes = np.flatnonzero(present)
+    code_index = np.zeros(CODE_POINT_RANGE, dtype=np.int64)
+    code_index[distinct_codes] = np.arange(len(distinct_codes))
+    char_ids = code_index[codes]
+
+    # 复杂度因子：每行去重后的字符数
+    distinct_count = len(distinct_codes)
+    if count * distinct_count <= UNIQUE_MATRIX_LIMIT:
+        seen = np.zeros((count, distinct_count), dtype=bool)
+        seen[rows, char_ids] = True
+        unique_chars = seen.sum(axis=1)
+    else:
+        unique_keys = np.unique(rows * distinct_count + char_ids)
+        unique_chars = np.bincount(unique_keys // distinct_count, minlength=count)
+
+    # 特殊字符因子：只对整批中出现过的不同字符做一次分类
+    is_special = np.fromiter(
+        (
+            not chr(code).isalnum() and not chr(code).isspace()
+            for code in distinct_codes.tolist()
+        ),
+        dtype=np.float64,
+        count=distinct_count,
+    )
+    special_chars = np.bincount(rows, weights=is_special[char_ids], minlength=count)
+
+    base_price = 0.01
+    length_factor = np.minimum(lengths / 1000, 0.5)
+    complexity_factor = np.minimum(unique_chars / 100, 0.3)
+    special_factor = np.minimum(special_chars / 50, 0.2)
+
+    total_price = base_price + length_factor + complexity_factor + special_factor
+
+    # 确保价格在合理范围内，空内容固定为最低价
+    prices = np.clip(total_price, 0.001, 1.0)
+    prices[lengths == 0] = 0.001
+    return prices
+
+
+def iter_chunks(table: str, chunk_size: int):
+    """按token_id游标分块读取(token_id, content)"""
+    model = TABLES[table]
+    last_token_id = None
+
+    while True:
+        db = SessionLocal()
+        try:
+            query = select(model.token_id, model.content).order_by(model.token_id)
+            if last_token_id is not None:
+                query = query.where(model.token_id > last_token_id)
+            rows: List[Tuple] = db.execute(query.limit(chunk_size)).all()
+        finally:
+            db.close()
+
+        if not rows:
+            return
+
+        yield rows
+        last_token_id = rows[-1][0]
+
+
+def reprice_table(table: str, chunk_size: int, dry_run: bool = False) -> int:
+    """重新计算一张表的evaluate_price，返回处理的行数"""
+    model = TABLES[table]
+    total_rows = 0
+    started = time.perf_counter()
+
+    for rows in iter_chunks(table, chunk_size):
+        chunk_started = time.perf_counter()
+        token_ids = [row[0] for row in rows]
+        prices = calculate_prices_traditional([row[1] or "" for row in rows])
+
+        if not dry_run:
+            db = SessionLocal()
+            try:
+                # 按主键批量UPDATE
+                db.execute(
+                    update(model),
+                    [
+                        {"token_id": token_id, "evaluate_price": price}
+                        for token_id, price in zip(token_ids, prices.tolist())
+                    ],
+                )
+                db.commit()
+            finally:
+                db.close()
+
+        total_rows += len(rows)
+        chunk_elapsed = time.perf_counter() - chunk_started
+        print(
+            f"[{table}] {total_rows} rows repriced, "
+            f"chunk {len(rows) / max(chunk_elapsed, 1e-9):.0f} rows/sec"
+        )
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"[{table}] done: {total_rows} rows in {elapsed:.2f}s "
+        f"({total_rows / max(elapsed, 1e-9):.0f} rows/sec)"
+    )
+    return total_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="使用传统算法批量重新估价NFT")
+    parser.add_argument(
+        "--table",
+        choices=[*TABLES.keys(), "all"],
+        default="all",
+        help="要重新估价的表",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000, help="每批处理的行数")
+    parser.add_argument("--dry-run", action="store_true", help="只计算不写回数据库")
+    args = parser.parse_args()
+
+    tables = list(TABLES.keys()) if args.table == "all" else [args.table]
+    for table in tables:
+        reprice_table(table, args.chunk_size, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,720 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+from app.database import AsyncSessionLocal
+from app.dao.checkpoint_dao import AsyncCheckpointDAO, CheckpointConflictError
+from app.utils.batch_writer import WindowJournal, WindowWriter, revert_windows
+from app.utils.chain_registry import ChainConfig, get_chains
+from app.utils.evaluate import calculate_price
+from app.utils.head_tracker import HeadTracker
+from app.utils.event_pipeline import EventPipeline
+from app.utils.live_feed import feed_event, live_feed
+from app.utils.log_fetcher import AdaptiveLogFetcher
+from app.utils.tx_manager import PriceCoalescer
+from app.config import settings
+import json
+
+# 配置日志
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WindowRecord:
+    """已处理窗口的末尾区块哈希与回滚日志"""
+
+    window_id: int
+    from_block: int
+    to_block: int
+    block_hash: bytes
+    journal: WindowJournal
+
+
+class ChainIndexer:
+    """
+    单条链的事件索引器，链之间的差异全部来自ChainConfig。
+    - 拉取Minted/Bought事件，写入数据库，估价并提交setPrice
+    - 更新排行榜与实时推送，按窗口保存检查点
+    - 只处理达到确认深度的区块；保留最近窗口的末尾区块哈希与回滚日志，
+      发现区块重组时回滚分叉点之后的窗口并从分叉点重新处理
+    """
+
+    def __init__(self, config: ChainConfig):
+        self.config = config
+        self.client = config.client
+        self.w3: Optional[AsyncWeb3] = None
+        self.nft_contract: Optional[AsyncContract] = None
+        self.launchpad_contract: Optional[AsyncContract] = None
+        self.minted_fetcher: Optional[AdaptiveLogFetcher] = None
+        self.bought_fetcher: Optional[AdaptiveLogFetcher] = None
+        self.is_running = False
+        self.chain = config.name
+        self.last_processed_block = 0
+        self.price_coalescer = PriceCoalescer()
+        # 当前窗口的回滚日志；窗口失败重试时沿用，保证重试前的写入也能回滚
+        self.journal: Optional[WindowJournal] = None
+        self.writer = WindowWriter(config.model, config.dao)
+        self.recent_windows: Deque[WindowRecord] = deque(
+            maxlen=max(1, settings.REORG_RING_SIZE)
+        )
+        # 窗口序号 -> 尚未确认的setPrice交易数；被回滚的窗口发出的交易确认后不再推送
+        self._window_seq = 0
+        self._unconfirmed: Dict[int, int] = {}
+        self._reverted_windows: Set[int] = set()
+        # token_id -> 已重试次数；失败的setPrice在下一个窗口按当前价格重新提交
+        self._failed_prices: Dict[int, int] = {}
+        self.pipeline = EventPipeline(
+            self.chain, config.worker_count, config.queue_size
+        )
+        self.head_tracker = HeadTracker(
+            self.chain,
+            config.ws_url,
+            config.poll_min_interval,
+            config.poll_max_interval,
+        )
+
+    async def initialize(self):
+        """初始化事件监听器"""
+        try:
+            await self.client.initialize()
+            self.w3 = self.client.w3
+            self.nft_contract = self.client.contract
+
+            # 初始化AiLaunchpad合约
+            launchpad_address = self.config.launchpad_address
+            with open(self.config.launchpad_abi_path, "r") as f:
+                launchpad_abi = json.load(f)
+
+            self.launchpad_contract = self.w3.eth.contract(
+                address=launchpad_address, abi=launchpad_abi
+            )
+
+            if not self.w3 or not self.nft_contract or not self.launchpad_contract:
+                raise Exception("Failed to initialize Web3 or contracts")
+
+            self.minted_fetcher = AdaptiveLogFetcher(
+                f"{self.chain}.Minted", self.nft_contract.events.Minted
+            )
+            self.bought_fetcher = AdaptiveLogFetcher(
+                f"{self.chain}.Bought", self.launchpad_contract.events.Bought
+            )
+
+            # 从持久化的检查点恢复；首次启动时以当前区块号作为起始点
+            checkpoint = await self._load_checkpoint()
+            if checkpoint is None:
+                checkpoint = await self.w3.eth.block_number
+            # 所有合约的检查点统一到恢复点，之后按窗口条件推进
+            async with AsyncSessionLocal() as db:
+                await AsyncCheckpointDAO.save(
+                    db, self.chain, self._checkpoint_contracts(), checkpoint
+                )
+            self.last_processed_block = checkpoint
+            self._reset_window_state()
+            logger.info(
+                f"[{self.chain}] indexer initialized at block "
+                f"{self.last_processed_block}"
+            )
+
+        except Exception as e:
+            logger.error(f"[{self.chain}] failed to initialize indexer: {e}")
+            raise
+
+    def _reset_window_state(self):
+        """
+        丢弃之前处理的窗口记录与回滚日志
+        - 重新当选或检查点被其他进程推进后，这些窗口之后的记录可能已被其他进程改写，
+          不能再用于回滚
+        """
+        self.journal = None
+        self.recent_windows.clear()
+        self._unconfirmed.clear()
+        self._reverted_windows.clear()
+        self._failed_prices.clear()
+
+    async def start_listening(self):
+        """开始监听事件"""
+        if not self.w3 or not self.nft_contract or not self.launchpad_contract:
+            await self.initialize()
+
+        self.is_running = True
+        self.pipeline.start()
+        self.head_tracker.start()
+        logger.info(f"[{self.chain}] starting indexer...")
+
+        try:
+            while self.is_running:
+                try:
+                    had_events = await self._process_new_blocks()
+                    # 订阅到新区块时立即处理，否则按自适应间隔轮询
+                    self.head_tracker.record_activity(had_events)
+                    await self.head_tracker.wait()
+                except Exception as e:
+                    logger.error(f"[{self.chain}] error in indexer: {e}")
+                    await asyncio.sleep(10)  # 出错时等待10秒再重试
+        finally:
+            await self.head_tracker.stop()
+            await self.pipeline.stop()
+            await self.client.receipt_tracker.stop()
+
+    def stop_listening(self):
+        """停止监听事件"""
+        self.is_running = False
+        logger.info(f"[{self.chain}] indexer stopped")
+
+    def _checkpoint_contracts(self) -> List[str]:
+        """需要记录检查点的合约地址"""
+        return [self.nft_contract.address, self.launchpad_contract.address]
+
+    async def _load_checkpoint(self) -> Optional[int]:
+        """读取检查点，多个合约的进度不一致时从最小的区块恢复"""
+        async with AsyncSessionLocal() as db:
+            blocks = [
+                await AsyncCheckpointDAO.get_last_block(db, self.chain, address)
+                for address in self._checkpoint_contracts()
+            ]
+
+        blocks = [block for block in blocks if block is not None]
+        return min(blocks) if blocks else None
+
+    async def _safe_head(self) -> int:
+        """达到确认深度的最新区块"""
+        return await self.w3.eth.block_number - self.config.confirmations
+
+    async def _block_hash(self, block_number: int) -> bytes:
+        block = await self.w3.eth.get_block(block_number)
+        return bytes(block["hash"])
+
+    async def _check_reorg(self):
+        """
+        检查最近处理的窗口是否仍在主链上
+        - 末尾区块哈希变化时，从新到旧找到仍在主链上的窗口作为分叉点
+        - 回滚分叉点之后的窗口，下一轮从分叉点重新处理
+        """
+        if not self.recent_windows:
+            return
+        latest = self.recent_windows[-1]
+        if await self._block_hash(latest.to_block) == latest.block_hash:
+            return
+
+        records = list(self.recent_windows)
+        kept = len(records) - 1
+        while kept > 0:
+            record = records[kept - 1]
+            if await self._block_hash(record.to_block) == record.block_hash:
+                break
+            kept -= 1
+        reverted = records[kept:]
+
+        if kept:
+            fork_block = records[kept - 1].to_block
+        else:
+            fork_block = reverted[0].from_block - 1
+            logger.error(
+                f"[{self.chain}] reorg may be deeper than the {len(reverted)} "
+                f"tracked windows, rolling back to block {fork_block}"
+            )
+        await self._rollback(reverted, fork_block)
+        # 回滚成功后才移出记录，失败时下一轮重新检查
+        for _ in reverted:
+            self.recent_windows.pop()
+
+    async def _rollback(self, reverted: List[WindowRecord], fork_block: int):
+        """回滚一组窗口的数据库写入，并在同一事务中把检查点退回到分叉点"""
+        journals = [record.journal for record in reverted]
+        token_ids = list(
+            {
+                str(token_id): token_id
+                for journal in journals
+                for token_id in journal.token_ids
+            }.values()
+        )
+        dao = self.config.dao
+
+        async with AsyncSessionLocal() as db:
+            removed = {
+                str(nft.token_id): nft
+                for nft in await dao.get_by_token_ids(db, token_ids)
+            }
+            try:
+                await revert_windows(db, journals)
+                await AsyncCheckpointDAO.compare_and_set(
+                    db,
+                    self.chain,
+                    self._checkpoint_contracts(),
+                    self.last_processed_block,
+                    fork_block,
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        self.last_processed_block = fork_block
+        self._reverted_windows.update(
+            record.window_id
+            for record in reverted
+            if record.window_id in self._unconfirmed
+        )
+        logger.warning(
+            f"[{self.chain}] reorg detected, rolled back blocks "
+            f"{fork_block + 1} to {reverted[-1].to_block} "
+            f"({len(token_ids)} NFTs), replaying from block {fork_block + 1}"
+        )
+
+        # 回滚后的状态：被恢复的记录推送reverted，被删除的记录推送removed
+        async with AsyncSessionLocal() as db:
+            restored = {
+                str(nft.token_id): nft
+                for nft in await dao.get_by_token_ids(db, token_ids)
+            }
+        self.config.leaderboard.invalidate()
+        events = []
+        for key in map(str, token_ids):
+            if key in restored:
+                events.append(feed_event(self.chain, "reverted", restored[key]))
+            elif key in removed:
+                events.append(feed_event(self.chain, "removed", removed[key]))
+        await live_feed.publish(events)
+
+    async def _process_new_blocks(self) -> bool:
+        """处理新区块中的事件，返回是否处理了事件"""
+        try:
+            await self._check_reorg()
+            current_block = await self._safe_head()
+
+            if current_block <= self.last_processed_block:
+                return False
+
+            # 落后太多时先分段追赶，追上后回到逐次跟随最新区块
+            if (
+                current_block - self.last_processed_block
+                > settings.LISTENER_BACKFILL_WINDOW
+            ):
+                await self._backfill()
+                return True
+
+            event_count = await self._process_window(
+                self.last_processed_block + 1, current_block
+            )
+            return event_count > 0
+
+        except CheckpointConflictError as e:
+            # 另一个进程也在索引（例如锁连接断开后已选出新的领导者），
+            # 本窗口已回滚，从数据库中的检查点继续，不再使用之前的窗口记录
+            logger.warning(f"{e}, reloading checkpoint")
+            checkpoint = await self._load_checkpoint()
+            if checkpoint is not None:
+                self.last_processed_block = checkpoint
+            self._reset_window_state()
+            return False
+        except Exception as e:
+            logger.error(f"Error processing new blocks: {e}")
+            return False
+
+    async def _backfill(self):
+        """
+        按固定大小的区块窗口追赶到最新区块
+        - 每轮并发拉取多个窗口的事件，再按区块顺序逐个处理
+        - 每个窗口处理完成后保存检查点
+        """
+        window = settings.LISTENER_BACKFILL_WINDOW
+        concurrency = max(1, self.config.backfill_concurrency)
+
+        current_block = await self._safe_head()
+        while self.is_running and current_block - self.last_processed_block > window:
+            logger.info(
+                f"Backfilling blocks {self.last_processed_block + 1} to {current_block}"
+            )
+            windows = []
+            from_block = self.last_processed_block + 1
+            while from_block <= current_block and len(windows) < concurrency:
+                to_block = min(from_block + window - 1, current_block)
+                windows.append((from_block, to_block))
+                from_block = to_block + 1
+
+            # 先取窗口末尾的区块哈希再拉取事件，拉取期间发生的重组会在下一轮被发现
+            block_hashes = await asyncio.gather(
+                *(self._block_hash(end) for _, end in windows)
+            )
+            results = await asyncio.gather(
+                *(self._fetch_events(start, end) for start, end in windows)
+            )
+            for (start, end), block_hash, events in zip(windows, block_hashes, results):
+                await self._process_window(start, end, events, block_hash)
+
+            current_block = await self._safe_head()
+
+    async def _fetch_events(
+        self, from_block: int, to_block: int
+    ) -> Tuple[List[Any], List[Any]]:
+        """预先拉取区块范围内的Minted和Bought事件（用于并发追赶）"""
+        minted_events = [
+            event
+            async for event in self.minted_fetcher.iter_events(from_block, to_block)
+        ]
+        bought_events = [
+            event
+            async for event in self.bought_fetcher.iter_events(from_block, to_block)
+        ]
+        return minted_events, bought_events
+
+    async def _iter_window_events(
+        self,
+        from_block: int,
+        to_block: int,
+        events: Optional[Tuple[List[Any], List[Any]]] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """按Minted、Bought的顺序产出窗口内的事件名与事件"""
+        if events is not None:
+            minted_events, bought_events = events
+            for event in minted_events:
+                yield "Minted", event
+            for event in bought_events:
+                yield "Bought", event
+            return
+
+        # 未预先拉取时以流式方式边拉取边产出
+        async for event in self.minted_fetcher.iter_events(from_block, to_block):
+            yield "Minted", event
+        async for event in self.bought_fetcher.iter_events(from_block, to_block):
+            yield "Bought", event
+
+    async def _process_window(
+        self,
+        from_block: int,
+        to_block: int,
+        events: Optional[Tuple[List[Any], List[Any]]] = None,
+        block_hash: Optional[bytes] = None,
+    ) -> int:
+        """处理一个区块窗口内的事件，完成后推进并保存检查点，返回事件数量"""
+        logger.info(f"Processing blocks {from_block} to {to_block}")
+
+        if block_hash is None:
+            block_hash = await self._block_hash(to_block)
+        if self.journal is None:
+            self.journal = WindowJournal(self.config.model)
+        self.writer = WindowWriter(self.config.model, self.config.dao, self.journal)
+
+        # 只处理关键事件；拉取或写入失败时异常向上抛出，检查点不会推进
+        event_count = 0
+        try:
+            minted_events = []
+            async for name, event in self._iter_window_events(
+                from_block, to_block, events
+            ):
+                event_count += 1
+                if name == "Minted":
+                    minted_events.append(event)
+                    if len(minted_events) >= settings.MINT_INGEST_BATCH_SIZE:
+                        await self._ingest_minted(minted_events)
+                        minted_events = []
+                    continue
+
+                # Bought之前先写入已收集的Minted，保证同一token的事件顺序
+                if minted_events:
+                    await self._ingest_minted(minted_events)
+                    minted_events = []
+                await self.pipeline.submit(
+                    event["args"]["tokenId"], self._handle_bought_event, event
+                )
+            if minted_events:
+                await self._ingest_minted(minted_events)
+
+            # 等待流水线处理完本窗口内的所有事件，写入数据库后再合并提交价格
+            await self.pipeline.join()
+            nfts = await self._flush_writes(to_block)
+        except Exception:
+            # 本窗口整体重试，等待已提交的任务结束并丢弃已合并的价格
+            await self.pipeline.join()
+            self.price_coalescer.drain()
+            raise
+
+        # 写入已与检查点一起提交，之后的步骤失败也不会重放本窗口
+        self.last_processed_block = to_block
+        self._window_seq += 1
+        self.recent_windows.append(
+            WindowRecord(
+                self._window_seq, from_block, to_block, block_hash, self.journal
+            )
+        )
+        self.journal = None
+
+        await self._publish_writes(nfts)
+        await self._flush_prices(self._window_seq)
+        return event_count
+
+    async def _ingest_minted(self, events: List[Any]):
+        """
+        批量幂等写入一批Minted事件对应的NFT
+        - 一条INSERT ... ON DUPLICATE KEY UPDATE写入整批，重复事件不会产生重复记录
+        - 只有新插入（或此前未完成估价）的NFT进入估价与setPrice流程
+        """
+        nfts = {}
+        for event in events:
+            token_id = event["args"]["tokenId"]
+            content = event["args"]["content"]
+            # 将bytes转换为字符串
+            if isinstance(content, bytes):
+                content_text = content.decode("utf-8")
+            else:
+                content_text = str(content)
+            nfts[str(token_id)] = (
+                token_id,
+                {
+                    "token_id": token_id,
+                    "owner_address": event["args"]["minter"],
+                    "content": content_text,
+                },
+            )
+
+        async with AsyncSessionLocal() as db:
+            pending, inserted = await self.config.dao.bulk_upsert_minted(
+                db, [nft_data for _, nft_data in nfts.values()]
+            )
+        self.journal.record_inserted(inserted)
+
+        skipped = len(nfts) - len(pending)
+        if skipped:
+            logger.info(f"{skipped} minted NFTs already exist, skipping")
+
+        for key in map(str, pending):
+            token_id, nft_data = nfts[key]
+            await self.pipeline.submit(
+                token_id, self._handle_minted_event, token_id, nft_data["content"]
+            )
+
+    async def _flush_writes(self, to_block: int) -> Dict[str, Any]:
+        """在一个事务中写入本窗口的所有变更并推进检查点，返回写入后的NFT记录"""
+        async with AsyncSessionLocal() as db:
+            return await self.writer.flush(
+                db,
+                self.chain,
+                self._checkpoint_contracts(),
+                self.last_processed_block,
+                to_block,
+            )
+
+    async def _publish_writes(self, nfts: Dict[str, Any]):
+        """按写入后的状态更新价格批次、排行榜与实时推送"""
+        writer = self.writer
+        # 购买后的价格以数据库中原子计算的结果为准
+        for token_id in writer.purchased_token_ids:
+            nft = nfts.get(str(token_id))
+            if nft is not None:
+                self.price_coalescer.add(token_id, nft.current_price)
+                logger.info(
+                    f"✅ Successfully processed Bought event for token {token_id}: "
+                    f"-> {nft.owner_address}, price updated to {nft.current_price}"
+                )
+
+        for nft in nfts.values():
+            self.config.leaderboard.offer(nft)
+
+        events = [
+            feed_event(self.chain, "minted", nfts[str(token_id)])
+            for token_id in writer.minted_token_ids
+            if str(token_id) in nfts
+        ]
+        events += [
+            feed_event(
+                self.chain,
+                "bought",
+                nfts[str(token_id)],
+                writer.previous_owners.get(str(token_id)),
+            )
+            for token_id in writer.purchased_token_ids
+            if str(token_id) in nfts
+        ]
+        await live_feed.publish(events)
+
+    async def _flush_prices(self, window_id: int):
+        """
+        将本窗口内合并后的最终价格提交到链上
+        - 每个token只发送一笔setPrice交易
+        - 非阻塞模式下所有交易通过一次JSON-RPC批量请求发送，由回执跟踪器在后台确认
+        """
+        # 之前失败的交易并入本窗口，价格以数据库中的当前价格为准，
+        # 避免失败较晚的旧价格覆盖之后窗口提交的新价格
+        attempts, self._failed_prices = self._failed_prices, {}
+        retry_ids = [t for t in attempts if t not in self.price_coalescer]
+        if retry_ids:
+            async with AsyncSessionLocal() as db:
+                nfts = await self.config.dao.get_by_token_ids(db, retry_ids)
+            for nft in nfts:
+                self.price_coalescer.add(int(nft.token_id), nft.current_price)
+
+        prices = self.price_coalescer.drain()
+        if not prices:
+            return
+
+        prices_wei = {
+            token_id: int(self.w3.to_wei(price_eth, "ether"))
+            for token_id, price_eth in prices.items()
+        }
+
+        if settings.TX_NONBLOCKING_SUBMIT:
+            results = await self.client.submit_nft_prices(prices_wei)
+        else:
+            results = await asyncio.gather(
+                *(
+                    self.client.set_nft_price(token_id, price_wei)
+                    for token_id, price_wei in prices_wei.items()
+                )
+            )
+
+        for (token_id, price_eth), price_result in zip(prices.items(), results):
+            attempt = attempts.get(token_id, 0)
+            if not price_result["success"]:
+                self._retry_price(token_id, attempt, price_result["error"])
+                continue
+
+            logger.info(
+                f"Successfully set price for token {token_id}: {price_result['transaction_hash']}"
+            )
+            if settings.TX_NONBLOCKING_SUBMIT:
+                self._unconfirmed[window_id] = self._unconfirmed.get(window_id, 0) + 1
+                on_confirmed, on_failed = self._price_callbacks(
+                    window_id, token_id, attempt
+                )
+                self.client.receipt_tracker.track(
+                    price_result["transaction_hash"],
+                    on_confirmed=on_confirmed,
+                    on_failed=on_failed,
+                )
+            else:
+                await self._publish_confirmed_price(token_id)
+
+    def _retry_price(self, token_id: int, attempt: int, reason):
+        """setPrice失败后在下一个窗口重新提交，超过最大重试次数后放弃"""
+        if attempt >= settings.TX_PRICE_MAX_RETRIES:
+            logger.error(
+                f"[{self.chain}] giving up setPrice for token {token_id} after "
+                f"{attempt + 1} attempts: {reason}"
+            )
+            return
+        logger.warning(
+            f"[{self.chain}] setPrice for token {token_id} failed ({reason}), "
+            f"retrying in the next window ({attempt + 1}/{settings.TX_PRICE_MAX_RETRIES})"
+        )
+        self._failed_prices[token_id] = attempt + 1
+
+    def _price_callbacks(self, window_id: int, token_id: int, attempt: int):
+        """生成交易确认与失败时的回调，两者都会结清该窗口的一笔待确认交易"""
+
+        def resolve() -> bool:
+            """结清一笔交易，返回发出该交易的窗口是否已被回滚"""
+            reverted = window_id in self._reverted_windows
+            remaining = self._unconfirmed.get(window_id, 1) - 1
+            if remaining > 0:
+                self._unconfirmed[window_id] = remaining
+            else:
+                self._unconfirmed.pop(window_id, None)
+                self._reverted_windows.discard(window_id)
+            return reverted
+
+        async def on_confirmed(receipt):
+            # 发出交易的窗口已被回滚时，以重新处理后的价格为准
+            if resolve():
+                logger.info(
+                    f"[{self.chain}] skip price event for token {token_id} "
+                    f"from a reverted window"
+                )
+                return
+            await self._publish_confirmed_price(token_id)
+
+        async def on_failed(reason):
+            # 被回滚窗口的价格已由重新处理的窗口重新提交，不再重试
+            if resolve():
+                return
+            self._retry_price(token_id, attempt, reason)
+
+        return on_confirmed, on_failed
+
+    async def _publish_confirmed_price(self, token_id: int):
+        """
+        setPrice确认后推送价格事件
+        - 当前价格已在窗口事务中写入，回执只表示链上价格已同步，不再修改数据库，
+          避免较晚到达的确认覆盖之后窗口中购买产生的价格
+        """
+        async with AsyncSessionLocal() as db:
+            nft = await self.config.dao.get_by_token_id(db, token_id)
+        if nft:
+            await live_feed.publish([feed_event(self.chain, "price", nft)])
+
+    async def _handle_minted_event(self, token_id: int, content_text: str):
+        """为新铸造的NFT估价，并记录到本窗口的写入单元"""
+        try:
+            logger.info(f"Processing mint event for content: {content_text[:100]}...")
+
+            # 使用AI智能评估价格
+            base_price = await calculate_price(content=content_text)
+            logger.info(f"evaluate success！Base_price: {base_price}")
+
+            # 计算NFT价格
+            final_price_eth = base_price + self.config.gas_factor
+
+            # 记录估价结果与含gas费用的当前价格，窗口结束时统一写入
+            self.writer.set_initial_price(token_id, base_price, final_price_eth)
+
+            # 加入本窗口的setPrice批次，窗口结束时统一提交
+            logger.info(f"Setting price for token {token_id}: {final_price_eth} ETH")
+            self.price_coalescer.add(token_id, final_price_eth)
+
+        except Exception as e:
+            logger.error(f"Error handling Minted event: {e}")
+
+    async def _handle_bought_event(self, event):
+        """处理单个Bought事件：记录所有者变更与价格上涨，窗口结束时统一写入"""
+        token_id = event["args"]["tokenId"]
+        buyer = event["args"]["buyer"]
+        self.writer.add_purchase(token_id, buyer)
+        logger.info(f"Recorded Bought event for token {token_id}: -> {buyer}")
+
+
+class IndexerScheduler:
+    """
+    在同一个事件循环中并发运行所有已注册链的索引器。
+    - 每条链一个协程任务，链之间互不阻塞，不额外占用线程
+    - 每条链的处理并发与背压由ChainConfig中的流水线参数限制
+    - 单条链初始化失败时只跳过该链
+    """
+
+    def __init__(self):
+        self.indexers: Dict[str, ChainIndexer] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """初始化并启动所有已注册链的索引器"""
+        indexers = [
+            self.indexers.get(config.name) or ChainIndexer(config)
+            for config in get_chains()
+        ]
+        results = await asyncio.gather(
+            *(indexer.initialize() for indexer in indexers), return_exceptions=True
+        )
+        for indexer, result in zip(indexers, results):
+            if isinstance(result, Exception):
+                logger.error(f"[{indexer.chain}] indexer not started: {result}")
+                continue
+            self.indexers[indexer.chain] = indexer
+            self._tasks.append(asyncio.create_task(indexer.start_listening()))
+        logger.info(f"Started indexers: {', '.join(self.indexers) or 'none'}")
+
+    async def stop(self):
+        """停止所有索引器，等待正在运行的任务结束"""
+        for indexer in self.indexers.values():
+            indexer.stop_listening()
+        # 取消正在等待或处理中的任务，确保再次启动前旧任务已经结束
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("All indexers stopped")
+
+
+# 创建全局索引调度器实例
+indexer_scheduler = IndexerScheduler()
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+from app.config import settings
+from app.dao.nft_dao import AsyncNFTDAO
+from app.dao.nft_dao_polkadot import AsyncNFTPolkadotDAO
+from app.models import NFTDB, NFTPolkadotDB
+from app.utils.evm_client import AsyncEVMClient
+from app.utils.leaderboard import (
+    PriceLeaderboard,
+    nft_leaderboard,
+    nft_polkadot_leaderboard,
+)
+
+
+@dataclass
+class ChainConfig:
+    """
+    一条链的索引配置。
+    - name同时用作检查点、实时推送与跨链接口中的链标识
+    - client由RPC地址、NFT合约地址与ABI构建，提供RPC连接、NFT合约与setPrice发送
+    """
+
+    name: str
+    rpc_url: str
+    nft_address: str
+    launchpad_address: str
+    model: Any
+    dao: Any
+    leaderboard: PriceLeaderboard
+    # 估价结果之上附加的gas费用（原生代币）
+    gas_factor: float
+    # 确认深度：只处理到最新区块减去该深度的区块
+    confirmations: int = 0
+    # newHeads订阅地址，为空时使用自适应轮询
+    ws_url: str = ""
+    poll_min_interval: float = settings.HEAD_POLL_MIN_INTERVAL
+    poll_max_interval: float = settings.HEAD_POLL_MAX_INTERVAL
+    # 事件处理流水线的并发数与每个worker的队列深度（背压）
+    worker_count: int = settings.EVENT_WORKER_COUNT
+    queue_size: int = settings.EVENT_QUEUE_SIZE
+    # 追赶时并发拉取的区块窗口数
+    backfill_concurrency: int = settings.LISTENER_BACKFILL_CONCURRENCY
+    nft_abi_path: str = "contracts/AiTextNFT.json"
+    launchpad_abi_path: str = "contracts/AiLaunchpad.json"
+    private_key: str = field(default=settings.PRIVATE_KEY, repr=False)
+    client: AsyncEVMClient = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.client = AsyncEVMClient(
+            self.name,
+            self.rpc_url,
+            self.nft_address,
+            self.nft_abi_path,
+            self.private_key,
+        )
+
+
+# 链标识 -> 配置，按注册顺序排列
+chain_registry: Dict[str, ChainConfig] = {}
+
+
+def register_chain(config: ChainConfig):
+    """注册一条链，重复注册时覆盖之前的配置"""
+    chain_registry[config.name] = config
+
+
+def get_chains() -> List[ChainConfig]:
+    """获取所有已注册的链"""
+    return list(chain_registry.values())
+
+
+register_chain(
+    ChainConfig(
+        name="evm",
+        rpc_url=settings.EVM_RPC_URL,
+        nft_address=settings.NFT_CONTRACT_ADDRESS,
+        launchpad_address=settings.LAUNCHPAD_CONTRACT_ADDRESS,
+        model=NFTDB,
+        dao=AsyncNFTDAO,
+        leaderboard=nft_leaderboard,
+        gas_factor=0.0001,
+        confirmations=settings.EVM_CONFIRMATIONS,
+        ws_url=settings.EVM_WS_URL,
+    )
+)
+register_chain(
+    ChainConfig(
+        name="polkadot",
+        rpc_url=settings.POLKADOT_RPC_URL,
+        nft_address=settings.POLKADOT_NFT_CONTRACT_ADDRESS,
+        launchpad_address=settings.POLKADOT_LAUNCHPAD_CONTRACT_ADDRESS,
+        model=NFTPolkadotDB,
+        dao=AsyncNFTPolkadotDAO,
+        leaderboard=nft_polkadot_leaderboard,
+        gas_factor=0.001,
+        confirmations=settings.POLKADOT_CONFIRMATIONS,
+        ws_url=settings.POLKADOT_WS_URL,
+    )
+)
@@ -1,16 +1,71 @@
 import asyncio
-import json
 import logging
 import hashlib
+import unicodedata
 import aiohttp
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import List, Optional, Set, Tuple
 from app.config import settings
+from app.utils.evaluation_cache import evaluation_cache
 
 logger = logging.getLogger(__name__)
 
 PRICING_API_URL = "http://43.134.74.254:23587/chat"
 
+# 应用级共享的HTTP会话，复用连接池与keep-alive连接
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    获取估价API的共享HTTP会话（首次调用时创建）
+
+    Returns:
+        带连接数上限、keep-alive及独立连接/读取超时的会话
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.PRICING_API_MAX_CONNECTIONS,
+            keepalive_timeout=settings.PRICING_API_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=settings.PRICING_API_CONNECT_TIMEOUT,
+            sock_read=settings.PRICING_API_READ_TIMEOUT,
+        )
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"Content-Type": "application/json"},
+        )
+    return _http_session
+
+
+async def close_http_session():
+    """关闭共享HTTP会话（应用关闭时调用）"""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+def score_to_price(score_total: float) -> float:
+    """
+    将估价API的0-100分数转换为价格
+
+    Args:
+        score_total: 估价API返回的总分
+
+    Returns:
+        0-0.01范围内的价格
+    """
+    # 将0-100的分数转换为0-0.01的价格
+    # score_total / 100 * 0.01 = score_total / 10000
+    price = score_total / 10000
+
+    # 确保价格在合理范围内 (0-0.01)
+    return max(0, min(price, 0.01))
+
 
 async def call_pricing_api(content: str) -> Optional[float]:
     """
@@ -23,37 +78,23 @@ async def call_pricing_api(content: str) -> Optional[float]:
         估价结果
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            payload = {"content": content}
-
-            headers = {
-                "Content-Type": "application/json",
-            }
-
-            async with session.post(
-                PRICING_API_URL,
-                json=payload,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    # 获取score_total并转换为价格
-                    score_total = result.get("score_total", 0)
-                    print(f"score_total: {score_total}")
-                    
-                    # 将0-100的分数转换为0-0.01的价格
-                    # score_total / 100 * 0.01 = score_total / 10000
-                    price = score_total / 10000
-                    
-                    # 确保价格在合理范围内 (0-0.01)
-                    price = max(0, min(price, 0.01))
-                    
-                    logger.info(f"估价成功: score_total={score_total}, price={price}")
-                    return price
-                else:
-                    logger.error(f"估价失败，状态码: {response.status}")
-                    return None
+        session = get_http_session()
+        payload = {"content": content}
+
+        async with session.post(PRICING_API_URL, json=payload) as response:
+            if response.status == 200:
+                result = await response.json()
+                # 获取score_total并转换为价格
+                score_total = result.get("score_total", 0)
+                print(f"score_total: {score_total}")
+
+                price = score_to_price(score_total)
+
+                logger.info(f"估价成功: score_total={score_total}, price={price}")
+                return price
+            else:
+                logger.error(f"估价失败，状态码: {response.status}")
+                return None
 
     except asyncio.TimeoutError:
         logger.error("估价超时")
@@ -63,6 +104,139 @@ async def call_pricing_api(content: str) -> Optional[float]:
         return None
 
 
+async def call_pricing_batch_api(contents: List[str]) -> List[Optional[float]]:
+    """
+    调用外部估价 API 的批量接口
+
+    Args:
+        contents: 要评估的内容列表
+
+    Returns:
+        与contents一一对应的估价结果
+    """
+    session = get_http_session()
+    payload = {"contents": contents}
+
+    async with session.post(settings.PRICING_API_BATCH_URL, json=payload) as response:
+        if response.status != 200:
+            raise RuntimeError(f"批量估价失败，状态码: {response.status}")
+
+        result = await response.json()
+        items = result.get("results", [])
+        if len(items) != len(contents):
+            raise RuntimeError(
+                f"批量估价结果数量不匹配: {len(items)} != {len(contents)}"
+            )
+
+        return [
+            score_to_price(item.get("score_total", 0)) if item else None
+            for item in items
+        ]
+
+
+class BatchEvaluator:
+    """
+    估价请求微批处理器。
+    - 在几毫秒的时间窗口内（或达到批量上限时）收集并发的估价请求
+    - 估价服务提供批量接口时合并为一次请求，否则以有界并发逐个请求
+    - 同一批次内相同的内容只评估一次，每个调用方拿到各自的结果
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int,
+        max_wait_ms: float,
+        fanout_limit: int,
+        batch_enabled: bool,
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.fanout_limit = max(1, fanout_limit)
+        self.batch_enabled = batch_enabled
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # 事件循环只持有任务的弱引用，运行中的批次需要在这里保留引用
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def evaluate(self, content: str) -> Optional[float]:
+        """提交一个估价请求并等待本批次的结果"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((content, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        contents = list(dict.fromkeys(content for content, _ in batch))
+
+        try:
+            prices = await self._evaluate_contents(contents)
+        except Exception as e:
+            logger.error(f"批量估价异常: {e}")
+            prices = [None] * len(contents)
+
+        results = dict(zip(contents, prices))
+        for content, future in batch:
+            if not future.done():
+                future.set_result(results.get(content))
+
+    async def _evaluate_contents(self, contents: List[str]) -> List[Optional[float]]:
+        if self.batch_enabled and len(contents) > 1:
+            try:
+                return await call_pricing_batch_api(contents)
+            except Exception as e:
+                logger.error(f"批量估价接口不可用，改为逐个请求: {e}")
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.fanout_limit)
+
+        async def evaluate_one(content: str) -> Optional[float]:
+            async with self._semaphore:
+                return await call_pricing_api(content)
+
+        return await asyncio.gather(*(evaluate_one(content) for content in contents))
+
+
+# 创建全局估价微批处理器实例
+pricing_evaluator = BatchEvaluator(
+    max_batch_size=settings.PRICING_BATCH_MAX_SIZE,
+    max_wait_ms=settings.PRICING_BATCH_MAX_WAIT_MS,
+    fanout_limit=settings.PRICING_FANOUT_LIMIT,
+    batch_enabled=bool(settings.PRICING_API_BATCH_URL),
+)
+
+
+def content_hash(content: str) -> str:
+    """
+    计算内容的规范化哈希
+
+    Args:
+        content: 要评估的内容
+
+    Returns:
+        Unicode NFKC规范化并合并空白后的SHA-256十六进制摘要
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", content).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
 def calculate_price_traditional(content: str) -> float:
     """
     传统算法估价（作为备用方案）
@@ -103,9 +277,17 @@ async def calculate_price(content: str) -> float:
     Args:
         content: 要评估的内容
     """
+    key = content_hash(content)
+    cached_price = await evaluation_cache.get(key)
+    if cached_price is not None:
+        logger.info(f"命中估价缓存: {cached_price}")
+        return cached_price
+
     try:
-        price = await call_pricing_api(content)
+        price = await pricing_evaluator.evaluate(content)
         if price is not None:
+            # 只缓存外部API的结果，传统算法的兜底价格不缓存
+            await evaluation_cache.set(key, price)
             return price
 
     except Exception as e:
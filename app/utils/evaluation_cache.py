@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from app.config import settings
+from app.database import SessionLocal
+from app.dao.evaluation_cache_dao import EvaluationCacheDAO
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationCache:
+    """
+    两级估价缓存。
+    - 进程内LRU：命中时无需任何IO
+    - 数据库：进程重启后仍然有效
+    - 缓存项带有估价模型版本与过期时间，模型版本变化或过期后视为未命中
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int, model_version: str):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.model_version = model_version
+        # content_hash -> (price, 过期时间戳)
+        self._entries: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, content_hash: str) -> Optional[float]:
+        """按内容哈希查询估价，依次查询进程内LRU与数据库"""
+        entry = self._entries.get(content_hash)
+        if entry is not None:
+            price, expires_at = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(content_hash)
+                self.hits += 1
+                return price
+            del self._entries[content_hash]
+
+        try:
+            cached = await asyncio.to_thread(self._load, content_hash)
+        except Exception as e:
+            logger.error(f"读取估价缓存失败: {e}")
+            cached = None
+
+        if cached is None:
+            self.misses += 1
+            return None
+
+        price, expires_at = cached
+        self._remember(content_hash, price, expires_at)
+        self.hits += 1
+        return price
+
+    async def set(self, content_hash: str, price: float):
+        """写入估价结果到两级缓存"""
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        self._remember(content_hash, price, time.time() + self.ttl_seconds)
+
+        try:
+            await asyncio.to_thread(self._store, content_hash, price, expires_at)
+        except Exception as e:
+            logger.error(f"写入估价缓存失败: {e}")
+
+    def _remember(self, content_hash: str, price: float, expires_at: float):
+        self._entries[content_hash] = (price, expires_at)
+        self._entries.move_to_end(content_hash)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _load(self, content_hash: str) -> Optional[Tuple[float, float]]:
+        db = SessionLocal()
+        try:
+            entry = EvaluationCacheDAO.get(db, content_hash, self.model_version)
+            if not entry:
+                return None
+            remaining = (entry.expires_at - datetime.utcnow()).total_seconds()
+            return float(entry.price), time.time() + remaining
+        finally:
+            db.close()
+
+    def _store(self, content_hash: str, price: float, expires_at: datetime):
+        db = SessionLocal()
+        try:
+            EvaluationCacheDAO.save(
+                db, content_hash, self.model_version, price, expires_at
+            )
+        finally:
+            db.close()
+
+
+# 创建全局估价缓存实例
+evaluation_cache = EvaluationCache(
+    max_size=settings.EVALUATION_CACHE_SIZE,
+    ttl_seconds=settings.EVALUATION_CACHE_TTL,
+    model_version=settings.PRICING_MODEL_VERSION,
+)
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class EventPipeline:
+    """
+    有界并发的事件处理流水线。
+    - 按key（token_id）哈希分配到固定worker，同一token的事件严格按提交顺序处理
+    - 不同token的事件在多个worker之间并行处理
+    - 每个worker的队列有最大深度，队列满时submit会等待（背压）
+    """
+
+    def __init__(self, name: str, worker_count: int, queue_size: int):
+        self.name = name
+        self.worker_count = max(1, worker_count)
+        self.queue_size = max(1, queue_size)
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        """启动worker（需在事件循环中调用）"""
+        if self.is_running:
+            return
+
+        self._queues = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in range(self.worker_count)
+        ]
+        self._workers = [
+            asyncio.create_task(self._worker(i, queue))
+            for i, queue in enumerate(self._queues)
+        ]
+        logger.info(
+            f"[{self.name}] pipeline started with {self.worker_count} workers, "
+            f"queue size {self.queue_size}"
+        )
+
+    async def stop(self):
+        """停止所有worker，未处理的事件将被丢弃"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queues = []
+        logger.info(f"[{self.name}] pipeline stopped")
+
+    async def submit(
+        self, key: Any, handler: Callable[..., Awaitable[Any]], *args: Any
+    ):
+        """提交一个事件处理任务，同一key的任务保证顺序执行"""
+        if not self.is_running:
+            self.start()
+
+        queue = self._queues[hash(key) % self.worker_count]
+        await queue.put((handler, args))
+
+    async def join(self):
+        """等待所有已提交的任务处理完成"""
+        for queue in self._queues:
+            await queue.join()
+
+    async def _worker(self, index: int, queue: asyncio.Queue):
+        while True:
+            handler, args = await queue.get()
+            try:
+                await handler(*args)
+            except Exception as e:
+                logger.error(
+                    f"[{self.name}] worker {index} failed to handle event: {e}"
+                )
+            finally:
+                queue.task_done()
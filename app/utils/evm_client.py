@@ -1,7 +1,11 @@
-from web3 import Web3
-from typing import Optional, Dict, Any
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+from typing import Optional, Dict, Any, List, Tuple
+import aiohttp
+import asyncio
 import json
+import time
 from app.config import settings
+from app.utils.tx_manager import AsyncNonceManager, ReceiptTracker
 
 
 class EVMClient:
@@ -205,5 +209,341 @@ class EVMClient:
             return {"success": False, "error": f"获取网络信息失败: {str(e)}"}
 
 
+# 所有异步链客户端共享的RPC连接池
+_rpc_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_rpc_session() -> aiohttp.ClientSession:
+    """获取异步链客户端共享的HTTP会话（首次调用时创建）"""
+    global _rpc_session
+    if _rpc_session is None or _rpc_session.closed:
+        connector = aiohttp.TCPConnector(limit=settings.RPC_MAX_CONNECTIONS)
+        timeout = aiohttp.ClientTimeout(total=settings.RPC_REQUEST_TIMEOUT)
+        _rpc_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    return _rpc_session
+
+
+async def close_rpc_session():
+    """关闭共享RPC会话（应用关闭时调用）"""
+    global _rpc_session
+    if _rpc_session is not None and not _rpc_session.closed:
+        await _rpc_session.close()
+    _rpc_session = None
+
+
+class AsyncEVMClient:
+    """
+    基于AsyncWeb3的EVM客户端，供运行在事件循环中的监听器使用。
+    - 所有RPC调用都是协程，不阻塞同一事件循环中的HTTP请求处理
+    - 所有异步链客户端共享一个aiohttp连接池
+    - 交易使用本地nonce，批量发送并由后台跟踪回执
+    - 链之间的差异（RPC地址、合约地址、ABI）全部来自构造参数
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpc_url: str,
+        contract_address: str,
+        abi_path: str,
+        private_key: str,
+    ):
+        self.name = name
+        self.rpc_url = rpc_url
+        self.contract_address = contract_address
+        self.abi_path = abi_path
+        self.private_key = private_key
+        self._w3: Optional[AsyncWeb3] = None
+        self._contract: Optional[Any] = None
+        self._chain_id: Optional[int] = None
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self._gas_price_cache: Optional[Tuple[int, float]] = None
+        # 串行化nonce分配与交易发送，保证交易按nonce顺序进入节点
+        self._send_lock = asyncio.Lock()
+        self.nonce_manager = AsyncNonceManager(self._fetch_pending_nonce)
+        self.receipt_tracker = ReceiptTracker(
+            self.name,
+            lambda: self.w3,
+            poll_interval=settings.TX_RECEIPT_POLL_INTERVAL,
+            timeout=settings.TX_RECEIPT_TIMEOUT,
+            on_timeout=self.nonce_manager.reset,
+        )
+
+    async def initialize(self):
+        """
+        初始化AsyncWeb3和合约实例（重复调用时直接返回）
+        - 连接共享的RPC连接池并加载合约ABI
+        """
+        async with self._init_lock:
+            if self._initialized:
+                return
+
+            if not all([self.rpc_url, self.contract_address, self.private_key]):
+                raise ValueError(f"缺少必要的{self.name}链配置，请检查 .env 文件")
+
+            provider = AsyncHTTPProvider(self.rpc_url)
+            await provider.cache_async_session(get_rpc_session())
+            w3 = AsyncWeb3(provider)
+
+            if not await w3.is_connected():
+                raise ConnectionError(f"无法连接到RPC: {self.rpc_url}")
+
+            with open(self.abi_path, "r") as f:
+                contract_abi = json.load(f)
+
+            self._chain_id = await w3.eth.chain_id
+            self._contract = w3.eth.contract(
+                address=self.contract_address, abi=contract_abi
+            )
+            self._w3 = w3
+            self._initialized = True
+            print(f"{self.name}异步客户端初始化成功")
+
+    @property
+    def w3(self) -> AsyncWeb3:
+        """获取AsyncWeb3实例（需先调用initialize）"""
+        if not self._initialized:
+            raise RuntimeError(f"{self.name}异步客户端尚未初始化")
+        return self._w3
+
+    @property
+    def contract(self) -> Any:
+        """获取合约实例（需先调用initialize）"""
+        if not self._initialized:
+            raise RuntimeError(f"{self.name}异步客户端尚未初始化")
+        return self._contract
+
+    async def _get_gas_price(self) -> int:
+        """获取合适的Gas价格（短时间内复用上次查询结果）"""
+        now = time.monotonic()
+        if self._gas_price_cache and now - self._gas_price_cache[1] < 10:
+            return self._gas_price_cache[0]
+
+        try:
+            current_price = await self.w3.eth.gas_price
+            max_price = self.w3.to_wei("1000", "gwei")
+            min_price = self.w3.to_wei("10", "gwei")
+            gas_price = max(min_price, min(current_price, max_price))
+        except Exception:
+            return self.w3.to_wei("50", "gwei")
+
+        self._gas_price_cache = (gas_price, now)
+        return gas_price
+
+    async def _fetch_pending_nonce(self) -> int:
+        """从链上获取账户的pending nonce"""
+        account = self.w3.eth.account.from_key(self.private_key)
+        return await self.w3.eth.get_transaction_count(account.address, "pending")
+
+    async def _sign_set_price_transaction(
+        self, account: Any, token_id: int, price_wei: int, gas_price: int, nonce: int
+    ) -> bytes:
+        """构建并签名setPrice交易"""
+        transaction = await self.contract.functions.setPrice(
+            token_id, price_wei
+        ).build_transaction(
+            {
+                "from": account.address,
+                "gas": 100000,
+                "gasPrice": gas_price,
+                "nonce": nonce,
+                "chainId": self._chain_id,
+            }
+        )
+        signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
+        return signed_txn.raw_transaction
+
+    async def _fill_nonce_gap(self, account: Any, nonce: int, gas_price: int) -> bool:
+        """
+        用一笔0值自转账占用发送失败的nonce（调用方需持有_send_lock）
+        - 批量请求中排在失败交易之后的交易已进入交易池，空出的nonce会让它们一直无法打包
+        - 占位交易也发送失败时返回False
+        """
+        transaction = {
+            "from": account.address,
+            "to": account.address,
+            "value": 0,
+            "gas": 21000,
+            "gasPrice": gas_price,
+            "nonce": nonce,
+            "chainId": self._chain_id,
+        }
+        signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
+        try:
+            await self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            return True
+        except Exception as e:
+            print(f"{self.name}占位交易发送失败(nonce={nonce}): {e}")
+            return False
+
+    async def _send_set_price_transaction(
+        self, account: Any, token_id: int, price_wei: int, gas_price: int
+    ) -> Any:
+        """使用本地nonce构建、签名并发送setPrice交易，返回交易哈希"""
+        async with self._send_lock:
+            raw_tx = await self._sign_set_price_transaction(
+                account,
+                token_id,
+                price_wei,
+                gas_price,
+                await self.nonce_manager.allocate(),
+            )
+
+            try:
+                return await self.w3.eth.send_raw_transaction(raw_tx)
+            except Exception:
+                # 发送失败时本地nonce可能已与链上不一致
+                self.nonce_manager.reset()
+                raise
+
+    def _error_result(self, e: Exception) -> Dict[str, Any]:
+        """将交易异常转换为统一的错误结果"""
+        error_msg = str(e)
+        if "insufficient funds" in error_msg.lower():
+            return {"success": False, "error": "账户余额不足"}
+        elif "nonce too low" in error_msg.lower():
+            return {"success": False, "error": "交易nonce过低，请重试"}
+        else:
+            return {"success": False, "error": f"设置价格失败: {error_msg}"}
+
+    async def set_nft_price(self, token_id: int, price_wei: int) -> Dict[str, Any]:
+        """
+        设置NFT价格
+        - 调用合约的setPrice方法
+        - 等待交易回执并返回交易结果
+        """
+        try:
+            await self.initialize()
+
+            account = self.w3.eth.account.from_key(self.private_key)
+            gas_price = await self._get_gas_price()
+
+            # 检查余额
+            balance = await self.w3.eth.get_balance(account.address)
+            estimated_cost = 100000 * gas_price
+
+            if balance < estimated_cost:
+                return {
+                    "success": False,
+                    "error": f"余额不足，需要 {self.w3.from_wei(estimated_cost, 'ether')} ETH",
+                }
+
+            tx_hash = await self._send_set_price_transaction(
+                account, token_id, price_wei, gas_price
+            )
+            receipt = await self.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=120
+            )
+
+            if receipt.status == 0:
+                return {
+                    "success": False,
+                    "error": "交易执行失败",
+                    "transaction_hash": tx_hash.hex(),
+                }
+
+            return {
+                "success": True,
+                "transaction_hash": tx_hash.hex(),
+                "gas_used": receipt.gasUsed,
+                "token_id": token_id,
+                "price_wei": price_wei,
+                "price_eth": float(self.w3.from_wei(price_wei, "ether")),
+            }
+
+        except Exception as e:
+            return self._error_result(e)
+
+    async def submit_nft_prices(self, prices: Dict[int, int]) -> List[Dict[str, Any]]:
+        """
+        批量非阻塞设置NFT价格
+        - 为每个token签名一笔setPrice交易（本地连续nonce）
+        - 通过一次JSON-RPC批量请求发送所有交易，按输入顺序返回每笔交易的结果
+        - 单笔交易被拒绝且其后有交易已进入交易池时，用占位交易补上空出的nonce
+        """
+        if not prices:
+            return []
+
+        try:
+            await self.initialize()
+
+            account = self.w3.eth.account.from_key(self.private_key)
+            gas_price = await self._get_gas_price()
+
+            async with self._send_lock:
+                nonces = [await self.nonce_manager.allocate() for _ in prices]
+                raw_txs = [
+                    await self._sign_set_price_transaction(
+                        account, token_id, price_wei, gas_price, nonce
+                    )
+                    for (token_id, price_wei), nonce in zip(prices.items(), nonces)
+                ]
+                responses = await self.w3.provider.make_batch_request(
+                    [
+                        ("eth_sendRawTransaction", [Web3.to_hex(raw_tx)])
+                        for raw_tx in raw_txs
+                    ]
+                )
+                if not isinstance(responses, list):
+                    # 节点拒绝了整个批量请求
+                    raise ValueError(responses.get("error", responses))
+
+                await self._repair_nonce_gaps(account, gas_price, nonces, responses)
+
+        except Exception as e:
+            self.nonce_manager.reset()
+            error_result = self._error_result(e)
+            return [dict(error_result, token_id=token_id) for token_id in prices]
+
+        results = []
+        for (token_id, price_wei), response in zip(prices.items(), responses):
+            if "error" in response:
+                error = response["error"]
+                message = error.get("message") if isinstance(error, dict) else error
+                results.append(
+                    dict(self._error_result(Exception(message)), token_id=token_id)
+                )
+                continue
+
+            results.append(
+                {
+                    "success": True,
+                    "transaction_hash": response["result"],
+                    "token_id": token_id,
+                    "price_wei": price_wei,
+                    "price_eth": float(self.w3.from_wei(price_wei, "ether")),
+                }
+            )
+        return results
+
+    async def _repair_nonce_gaps(
+        self,
+        account: Any,
+        gas_price: int,
+        nonces: List[int],
+        responses: List[Dict[str, Any]],
+    ):
+        """
+        处理批量发送中被拒绝的交易留下的nonce空洞（调用方需持有_send_lock）
+        - 之后有交易已被接受：发送占位交易补上该nonce，之后的交易才能正常打包
+        - 之后没有被接受的交易，或占位交易也失败：下次分配时从链上重新同步nonce
+        """
+        accepted = [
+            i for i, response in enumerate(responses) if "error" not in response
+        ]
+        last_accepted = accepted[-1] if accepted else -1
+        resync = False
+        for i, (nonce, response) in enumerate(zip(nonces, responses)):
+            if "error" not in response:
+                continue
+            if i > last_accepted or not await self._fill_nonce_gap(
+                account, nonce, gas_price
+            ):
+                resync = True
+        if resync:
+            self.nonce_manager.reset()
+
+
 # 创建全局唯一的EVM客户端实例
 evm_client = EVMClient()
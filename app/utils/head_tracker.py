@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class HeadTracker:
+    """
+    新区块跟踪器，决定事件监听器何时检查新区块。
+    - 配置了WebSocket地址时通过eth_subscribe("newHeads")订阅，新区块到达后立即唤醒
+    - 订阅不可用或断开时退回自适应轮询：最近的窗口包含事件时按最短间隔轮询，
+      空闲时间隔逐次翻倍，直到最长间隔
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ws_url: str,
+        min_interval: float,
+        max_interval: float,
+    ):
+        self.name = name
+        self.ws_url = ws_url
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval = min_interval
+        # 订阅收到的最新区块号
+        self.head: Optional[int] = None
+        self._new_head = asyncio.Event()
+        self._subscribed = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscribed(self) -> bool:
+        return self._subscribed
+
+    def start(self):
+        """配置了WebSocket地址时启动订阅"""
+        if self.ws_url and self._task is None:
+            self._task = asyncio.create_task(self._subscribe_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._subscribed = False
+
+    def record_activity(self, had_events: bool):
+        """根据上一次检查是否处理了事件调整轮询间隔"""
+        if had_events:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+    async def wait(self):
+        """等待下一次检查新区块的时机"""
+        if not self._subscribed:
+            await asyncio.sleep(self.interval)
+            return
+
+        # 订阅期间以最长间隔兜底，防止推送静默丢失
+        try:
+            await asyncio.wait_for(self._new_head.wait(), self.max_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._new_head.clear()
+
+    async def _subscribe_loop(self):
+        retry_delay = self.min_interval
+        while True:
+            try:
+                await self._subscribe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"[{self.name}] newHeads subscription unavailable, "
+                    f"falling back to polling: {e}"
+                )
+
+            # 订阅成功后断开时立即开始重连，连接失败时逐次延长重试间隔
+            if self._subscribed:
+                retry_delay = self.min_interval
+            self._subscribed = False
+            # 唤醒等待中的监听器，让其切换到轮询
+            self._new_head.set()
+
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, self.max_interval)
+
+    async def _subscribe(self):
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(self.ws_url, heartbeat=30) as ws:
+                await ws.send_str(
+                    json.dumps(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": 1,
+                            "method": "eth_subscribe",
+                            "params": ["newHeads"],
+                        }
+                    )
+                )
+                reply = await ws.receive_json(timeout=self.max_interval)
+                if "error" in reply:
+                    raise RuntimeError(reply["error"])
+
+                self._subscribed = True
+                logger.info(f"[{self.name}] subscribed to newHeads")
+                async for message in ws:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    data = json.loads(message.data)
+                    if data.get("method") != "eth_subscription":
+                        continue
+                    self.head = int(data["params"]["result"]["number"], 16)
+                    self._new_head.set()
+
+                raise ConnectionError("subscription closed")
@@ -1,7 +1,14 @@
 import jwt
+import base64
+import hashlib
+import hmac
+import json
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import settings
@@ -9,11 +16,79 @@ from app.config import settings
 security = HTTPBearer()
 
 
-def generate_challenge() -> str:
+# 已使用的登录挑战：nonce -> 过期时间戳，挑战过期后自动清除
+_used_challenge_nonces: Dict[str, float] = {}
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign_challenge(payload: str) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode("utf-8"), payload.encode("ascii"), hashlib.sha256
+    ).digest()
+    return _b64encode(digest)
+
+
+def generate_challenge(address: str) -> str:
     """
     生成登录挑战字符串
+    挑战自带地址、过期时间与随机数，并以SECRET_KEY签名，服务端无需保存
+    """
+    payload = _b64encode(
+        json.dumps(
+            {
+                "address": address,
+                "exp": int(time.time()) + settings.LOGIN_CHALLENGE_EXPIRE_SECONDS,
+                "nonce": secrets.token_hex(16),
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+    )
+    return f"{payload}.{_sign_challenge(payload)}"
+
+
+def verify_challenge(challenge: str, address: str) -> Optional[Dict[str, Any]]:
     """
-    return secrets.token_hex(32)
+    校验登录挑战的签名、地址与过期时间
+
+    Returns:
+        挑战内容；挑战无效、不属于该地址或已过期时返回None
+    """
+    try:
+        payload, signature = challenge.split(".")
+        if not hmac.compare_digest(signature, _sign_challenge(payload)):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except Exception:
+        return None
+
+    if claims.get("address") != address or claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def consume_challenge(claims: Dict[str, Any]) -> bool:
+    """
+    将登录挑战标记为已使用，防止在有效期内重放
+
+    Returns:
+        挑战此前未被使用时返回True
+    """
+    now = time.time()
+    for nonce, expires_at in list(_used_challenge_nonces.items()):
+        if expires_at < now:
+            del _used_challenge_nonces[nonce]
+
+    if claims["nonce"] in _used_challenge_nonces:
+        return False
+    _used_challenge_nonces[claims["nonce"]] = claims["exp"]
+    return True
 
 
 async def verify_sui_signature(address: str, challenge: str, signature: str) -> bool:
@@ -69,20 +144,115 @@ def generate_jwt(payload: Dict[str, Any]) -> str:
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+class VerifiedTokenCache:
+    """
+    已验证JWT的LRU缓存。
+    - 以令牌的SHA-256摘要为键，缓存解码后的声明，在令牌的exp到期时失效
+    - 命中时检查撤销记录，被撤销的令牌立即失效；撤销记录在令牌过期后清除
+    - authenticate作为同步依赖在线程池中执行，所有操作加锁
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        # 令牌摘要 -> (声明, 过期时间戳)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = (
+            OrderedDict()
+        )
+        # 令牌摘要 -> 过期时间戳
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at > time.time() and key not in self._revoked:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, claims: Dict[str, Any]):
+        expires_at = claims.get("exp")
+        if expires_at is None:
+            return
+        with self._lock:
+            self._entries[key] = (claims, float(expires_at))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, key: str) -> bool:
+        with self._lock:
+            return key in self._revoked
+
+    def revoke(self, key: str, expires_at: float):
+        now = time.time()
+        with self._lock:
+            for revoked_key, revoked_until in list(self._revoked.items()):
+                if revoked_until < now:
+                    del self._revoked[revoked_key]
+            self._entries.pop(key, None)
+            if expires_at >= now:
+                self._revoked[key] = expires_at
+
+
+# 创建全局JWT缓存实例
+verified_token_cache = VerifiedTokenCache(max_size=settings.JWT_CACHE_SIZE)
+
+
 def verify_jwt(token: str) -> Optional[Dict[str, Any]]:
     """
     验证JWT令牌
     """
+    key = VerifiedTokenCache.digest(token)
+    cached = verified_token_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    if verified_token_cache.is_revoked(key):
+        return None
+    verified_token_cache.set(key, payload)
+    return payload
+
+
+def revoke_jwt(token: str):
+    """
+    撤销JWT令牌，之后的验证均失败
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"verify_exp": False},
+        )
+    except jwt.InvalidTokenError:
+        # 无效的令牌本身无法通过验证，不需要记录
+        return
+    expires_at = payload.get("exp")
+    if expires_at is None:
+        expires_at = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    verified_token_cache.revoke(VerifiedTokenCache.digest(token), float(expires_at))
+
 
 def authenticate(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """
@@ -94,10 +264,7 @@ def authenticate(credentials: HTTPAuthorizationCredentials = Depends(security))
             status_code=status.HTTP_401_UNAUTHORIZED, detail="No JWT provided."
         )
 
-    token = credentials.credentials
-    print(f"Token: {token}")
-
-    decoded = verify_jwt(token)
+    decoded = verify_jwt(credentials.credentials)
     if not decoded or "address" not in decoded:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid JWT."
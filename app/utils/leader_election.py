@@ -0,0 +1,192 @@
+import asyncio
+import fcntl
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.config import settings
+from app.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+
+class MySQLLeaderLock:
+    """
+    基于MySQL GET_LOCK的领导者锁，可跨主机使用。
+    锁属于持有它的数据库连接，进程退出或连接断开时MySQL自动释放。
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._connection: Optional[AsyncConnection] = None
+
+    async def acquire(self) -> bool:
+        if self._connection is None:
+            self._connection = await async_engine.connect()
+        try:
+            result = await self._connection.execute(
+                text("SELECT GET_LOCK(:name, 0)"), {"name": self.name}
+            )
+            return result.scalar() == 1
+        except Exception:
+            await self._discard_connection()
+            raise
+
+    async def is_held(self) -> bool:
+        if self._connection is None:
+            return False
+        try:
+            result = await self._connection.execute(
+                text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"),
+                {"name": self.name},
+            )
+            return result.scalar() == 1
+        except Exception as e:
+            # 连接断开后锁已被MySQL释放
+            logger.error(f"Failed to check leader lock: {e}")
+            await self._discard_connection()
+            return False
+
+    async def release(self):
+        if self._connection is None:
+            return
+        try:
+            await self._connection.execute(
+                text("SELECT RELEASE_LOCK(:name)"), {"name": self.name}
+            )
+        finally:
+            await self._discard_connection()
+
+    async def _discard_connection(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                await connection.close()
+            except Exception:
+                pass
+
+
+class FileLeaderLock:
+    """
+    基于文件锁（flock）的领导者锁，只适用于同一主机上的多个进程。
+    进程退出时操作系统自动释放。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    async def acquire(self) -> bool:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    async def is_held(self) -> bool:
+        return self._fd is not None
+
+    async def release(self):
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class NoopLeaderLock:
+    """不做选举，当前进程始终为领导者（单进程部署）"""
+
+    async def acquire(self) -> bool:
+        return True
+
+    async def is_held(self) -> bool:
+        return True
+
+    async def release(self):
+        pass
+
+
+class LeaderElector:
+    """
+    领导者选举。
+    - 所有进程定期尝试获取同一把锁，获取成功的进程成为领导者并启动事件监听器
+    - 领导者定期确认锁仍被持有，失去锁时立即停止监听器
+    - 领导者进程退出后锁被释放，其余进程在下一次尝试时自动接管
+    """
+
+    def __init__(self, lock, interval: float):
+        self.lock = lock
+        self.interval = interval
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+        self._on_elected: Optional[Callable[[], Awaitable[None]]] = None
+        self._on_revoked: Optional[Callable[[], Awaitable[None]]] = None
+
+    def start(
+        self,
+        on_elected: Callable[[], Awaitable[None]],
+        on_revoked: Callable[[], Awaitable[None]],
+    ):
+        """启动选举循环"""
+        self._on_elected = on_elected
+        self._on_revoked = on_revoked
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """停止选举循环；是领导者时先停止监听器再释放锁"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self.is_leader:
+            await self._step_down()
+
+    async def _run(self):
+        while True:
+            try:
+                if not self.is_leader:
+                    if await self.lock.acquire():
+                        self.is_leader = True
+                        logger.info(f"Process {os.getpid()} elected as leader")
+                        await self._on_elected()
+                elif not await self.lock.is_held():
+                    logger.warning(f"Process {os.getpid()} lost leadership")
+                    await self._step_down()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Leader election error: {e}")
+
+            await asyncio.sleep(self.interval)
+
+    async def _step_down(self):
+        self.is_leader = False
+        try:
+            await self._on_revoked()
+        finally:
+            try:
+                await self.lock.release()
+            except Exception as e:
+                logger.error(f"Failed to release leader lock: {e}")
+
+
+def _create_lock():
+    backend = settings.LEADER_ELECTION_BACKEND.lower()
+    if backend == "mysql":
+        return MySQLLeaderLock(settings.LEADER_LOCK_NAME)
+    if backend == "file":
+        return FileLeaderLock(settings.LEADER_LOCK_FILE)
+    if backend == "none":
+        return NoopLeaderLock()
+    raise ValueError(f"Unknown leader election backend: {backend}")
+
+
+# 创建全局领导者选举实例
+leader_elector = LeaderElector(_create_lock(), settings.LEADER_ELECTION_INTERVAL)
@@ -0,0 +1,198 @@
+import asyncio
+import bisect
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, TypeAdapter
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.dao.nft_dao import AsyncNFTDAO
+from app.dao.nft_dao_polkadot import AsyncNFTPolkadotDAO
+from app.models import NFTListResponse, NFTPolkadotListResponse
+
+logger = logging.getLogger(__name__)
+
+
+class PriceLeaderboard:
+    """
+    进程内的价格排行榜（按current_price降序的前K名）。
+    - 启动时从数据库加载一次，之后由事件监听器在价格或所有者变化时写穿更新
+    - limit不超过K的排行榜请求直接由内存返回，并缓存序列化后的响应体
+    - 榜内NFT降价后可能被榜外NFT超过，此时标记为过期，下次请求时重新加载
+    - 定期重新加载，使未运行监听器的进程也能看到其他进程写入的变化
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dao: Any,
+        item_model: Type[BaseModel],
+        capacity: int,
+        refresh_interval: float,
+    ):
+        self.name = name
+        self.dao = dao
+        self.item_model = item_model
+        self.capacity = max(1, capacity)
+        self.refresh_interval = refresh_interval
+        self._adapter = TypeAdapter(List[item_model])
+        # 排序键按升序排列，即价格从高到低
+        self._keys: List[Tuple] = []
+        self._items: Dict[Any, BaseModel] = {}
+        self._sort_keys: Dict[Any, Tuple] = {}
+        # limit -> 序列化后的响应体
+        self._bodies: Dict[int, bytes] = {}
+        self._loaded_at: Optional[float] = None
+        self._stale = True
+        # 每次写入递增，用于发现加载期间发生的写入
+        self._version = 0
+        self._load_lock = asyncio.Lock()
+
+    @staticmethod
+    def _sort_key(item: BaseModel) -> Tuple:
+        """价格降序，空价格排在最后，同价时按token_id升序"""
+        price = item.current_price
+        return (price is None, -(price or 0), item.token_id)
+
+    def _to_item(self, nft: Any) -> BaseModel:
+        return self.item_model(
+            token_id=nft.token_id,
+            owner_address=nft.owner_address,
+            content=nft.content,
+            evaluate_price=float(nft.evaluate_price) if nft.evaluate_price else None,
+            current_price=float(nft.current_price) if nft.current_price else None,
+            created_at=nft.created_at,
+        )
+
+    def _needs_reload(self) -> bool:
+        if self._stale or self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at > self.refresh_interval
+
+    async def load(self):
+        """从数据库加载前K名"""
+        async with self._load_lock:
+            await self._load()
+
+    async def _load(self):
+        version = self._version
+        async with AsyncSessionLocal() as db:
+            nfts = await self.dao.get_ranking_by_price(db, self.capacity)
+
+        self._keys = []
+        self._items = {}
+        self._sort_keys = {}
+        for nft in nfts:
+            self._insert(self._to_item(nft))
+        self._bodies = {}
+        self._loaded_at = time.monotonic()
+        # 加载期间有写入时，快照可能早于该写入，下次请求时再加载一次
+        self._stale = self._version != version
+        logger.info(f"[{self.name}] leaderboard loaded with {len(self._keys)} NFTs")
+
+    def _insert(self, item: BaseModel):
+        key = self._sort_key(item)
+        bisect.insort(self._keys, key)
+        self._items[item.token_id] = item
+        self._sort_keys[item.token_id] = key
+
+    def _remove(self, token_id: Any):
+        key = self._sort_keys.pop(token_id)
+        del self._keys[bisect.bisect_left(self._keys, key)]
+        del self._items[token_id]
+
+    def offer(self, nft: Any):
+        """
+        NFT的价格或所有者变化后写入排行榜
+
+        Args:
+            nft: 数据库中的最新NFT记录
+        """
+        self._version += 1
+        if self._loaded_at is None:
+            return
+
+        item = self._to_item(nft)
+        key = self._sort_key(item)
+        was_member = item.token_id in self._sort_keys
+        is_full = len(self._keys) >= self.capacity
+
+        if was_member:
+            # 榜满时降价到末位之后，榜外可能有更高价的NFT，需要重新加载
+            if is_full and key > self._keys[-1]:
+                self._stale = True
+            self._remove(item.token_id)
+            self._insert(item)
+        elif not is_full:
+            self._insert(item)
+        elif key < self._keys[-1]:
+            self._insert(item)
+            self._remove(self._keys[-1][2])
+        else:
+            return
+
+        self._bodies = {}
+
+    def invalidate(self):
+        """数据被批量修改（如区块重组回滚）后调用，下次请求时重新加载"""
+        self._version += 1
+        self._stale = True
+        self._bodies = {}
+
+    async def get_items(self, limit: int) -> Optional[List[BaseModel]]:
+        """
+        获取前limit名
+
+        Returns:
+            排行榜条目；limit超出排行榜容量时返回None，由调用方查询数据库
+        """
+        if limit < 0 or limit > self.capacity:
+            return None
+
+        if self._needs_reload():
+            try:
+                async with self._load_lock:
+                    # 并发请求只由第一个请求加载
+                    if self._needs_reload():
+                        await self._load()
+            except Exception as e:
+                logger.error(f"[{self.name}] failed to load leaderboard: {e}")
+                return None
+
+        return [self._items[key[2]] for key in self._keys[:limit]]
+
+    async def get_body(self, limit: int) -> Optional[bytes]:
+        """
+        获取前limit名的JSON响应体
+
+        Returns:
+            序列化后的响应体；无法由排行榜返回时为None
+        """
+        body = self._bodies.get(limit)
+        if body is not None and not self._needs_reload():
+            return body
+
+        items = await self.get_items(limit)
+        if items is None:
+            return None
+
+        body = self._adapter.dump_json(items)
+        self._bodies[limit] = body
+        return body
+
+
+# 创建全局排行榜实例
+nft_leaderboard = PriceLeaderboard(
+    "evm",
+    AsyncNFTDAO,
+    NFTListResponse,
+    settings.LEADERBOARD_SIZE,
+    settings.LEADERBOARD_REFRESH_INTERVAL,
+)
+nft_polkadot_leaderboard = PriceLeaderboard(
+    "polkadot",
+    AsyncNFTPolkadotDAO,
+    NFTPolkadotListResponse,
+    settings.LEADERBOARD_SIZE,
+    settings.LEADERBOARD_REFRESH_INTERVAL,
+)
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Set, Tuple
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.dao.feed_event_dao import AsyncFeedEventDAO
+from app.models import FeedEventDB, NFTFeedEvent
+
+logger = logging.getLogger(__name__)
+
+
+class FeedSubscription:
+    """
+    一个客户端的订阅。
+    - chains/owner为空时不过滤
+    - 缓冲区有界，客户端消费过慢时丢弃最旧的事件，不阻塞其他客户端
+    """
+
+    def __init__(
+        self, chains: Optional[Set[str]], owner: Optional[str], buffer_size: int
+    ):
+        self.chains = chains
+        self.owner = owner.lower() if owner else None
+        self.dropped = 0
+        self._queue: "asyncio.Queue[Tuple[NFTFeedEvent, str]]" = asyncio.Queue(
+            maxsize=max(1, buffer_size)
+        )
+
+    def matches(self, event: NFTFeedEvent) -> bool:
+        if self.chains and event.chain_type not in self.chains:
+            return False
+        if self.owner:
+            # 购买事件同时推送给买方与卖方
+            addresses = {event.owner_address.lower()}
+            if event.previous_owner:
+                addresses.add(event.previous_owner.lower())
+            if self.owner not in addresses:
+                return False
+        return True
+
+    def put(self, event: NFTFeedEvent, payload: str):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait((event, payload))
+
+    async def get(self) -> Tuple[NFTFeedEvent, str]:
+        """等待下一个事件，返回事件与序列化后的JSON"""
+        return await self._queue.get()
+
+
+class LiveFeedBroker:
+    """
+    实时事件推送。
+    - 只有运行事件监听器的领导者进程产生事件，事件先写入数据库
+    - 领导者进程内的写入串行执行，事件ID按提交顺序递增，轮询按ID推进时不会跳过
+      较晚提交的较小ID
+    - 每个进程在有订阅者时轮询新事件，序列化一次后分发给本进程内匹配的订阅者
+    - 数据库查询次数与订阅者数量无关
+    """
+
+    def __init__(
+        self,
+        poll_interval: float,
+        buffer_size: int,
+        batch_size: int,
+        retention_seconds: int,
+    ):
+        self.poll_interval = poll_interval
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.retention_seconds = retention_seconds
+        self._subscribers: Set[FeedSubscription] = set()
+        self._relay_task: Optional[asyncio.Task] = None
+        self._last_pruned = 0.0
+        self._publish_lock = asyncio.Lock()
+
+    def subscribe(
+        self, chains: Optional[Set[str]] = None, owner: Optional[str] = None
+    ) -> FeedSubscription:
+        """注册订阅者，第一个订阅者到来时启动轮询"""
+        subscription = FeedSubscription(chains, owner, self.buffer_size)
+        self._subscribers.add(subscription)
+        if self._relay_task is None or self._relay_task.done():
+            self._relay_task = asyncio.create_task(self._relay())
+        return subscription
+
+    def unsubscribe(self, subscription: FeedSubscription):
+        """注销订阅者，没有订阅者时停止轮询"""
+        self._subscribers.discard(subscription)
+        if not self._subscribers and self._relay_task is not None:
+            self._relay_task.cancel()
+            self._relay_task = None
+
+    async def publish(self, events: List[dict]):
+        """
+        写入监听器产生的事件；推送失败不影响区块处理
+
+        Args:
+            events: feed_event()生成的事件
+        """
+        if not events:
+            return
+        try:
+            async with self._publish_lock, AsyncSessionLocal() as db:
+                await AsyncFeedEventDAO.add_many(db, events)
+                await self._prune(db)
+        except Exception as e:
+            logger.error(f"Failed to publish feed events: {e}")
+
+    async def _prune(self, db):
+        """定期删除超过保留时间的事件"""
+        now = time.monotonic()
+        if now - self._last_pruned < 60:
+            return
+        self._last_pruned = now
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        await AsyncFeedEventDAO.delete_before(db, cutoff)
+
+    async def _relay(self):
+        last_id = None
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    if last_id is None:
+                        # 只推送订阅之后产生的事件
+                        last_id = await AsyncFeedEventDAO.get_last_id(db)
+                    rows = await AsyncFeedEventDAO.get_after(
+                        db, last_id, self.batch_size
+                    )
+                for row in rows:
+                    self._fan_out(self._to_event(row))
+                    last_id = row.id
+                if len(rows) == self.batch_size:
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to poll feed events: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    def _fan_out(self, event: NFTFeedEvent):
+        payload = event.model_dump_json()
+        for subscription in list(self._subscribers):
+            if subscription.matches(event):
+                subscription.put(event, payload)
+
+    @staticmethod
+    def _to_event(row: FeedEventDB) -> NFTFeedEvent:
+        return NFTFeedEvent(
+            id=row.id,
+            chain_type=row.chain,
+            event_type=row.event_type,
+            token_id=row.token_id,
+            owner_address=row.owner_address,
+            previous_owner=row.previous_owner,
+            current_price=float(row.current_price) if row.current_price else None,
+            created_at=row.created_at,
+        )
+
+
+def feed_event(
+    chain: str, event_type: str, nft: Any, previous_owner: Optional[str] = None
+) -> dict:
+    """
+    根据写入后的NFT记录生成一条待发布的事件
+
+    Args:
+        previous_owner: 购买事件中变更前的所有者（卖方）
+    """
+    return {
+        "chain": chain,
+        "event_type": event_type,
+        "token_id": str(nft.token_id),
+        "owner_address": nft.owner_address,
+        "previous_owner": previous_owner,
+        "current_price": nft.current_price,
+        "created_at": datetime.utcnow(),
+    }
+
+
+# 创建全局实时推送实例
+live_feed = LiveFeedBroker(
+    poll_interval=settings.FEED_POLL_INTERVAL,
+    buffer_size=settings.FEED_CLIENT_BUFFER_SIZE,
+    batch_size=settings.FEED_RELAY_BATCH_SIZE,
+    retention_seconds=settings.FEED_RETENTION_SECONDS,
+)
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator
+import aiohttp
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# RPC节点拒绝过大区块范围或过多结果时的常见错误信息
+RANGE_ERROR_MARKERS = (
+    "block range",
+    "range too large",
+    "range is too large",
+    "too many blocks",
+    "too many results",
+    "too many logs",
+    "response size",
+    "query returned more than",
+    "max results",
+)
+
+# 节点限流时的常见错误信息；与范围错误的措辞有重叠，需要先判断
+RATE_LIMIT_MARKERS = (
+    "too many requests",
+    "rate limit",
+    "rate-limit",
+    "rate limited",
+    "request rate",
+    "exceeded its compute units",
+    "capacity exceeded",
+)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """判断是否为节点限流错误"""
+    if isinstance(error, aiohttp.ClientResponseError) and error.status == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def is_range_error(error: Exception) -> bool:
+    """判断是否为区块范围或结果数量超限的错误"""
+    if is_rate_limit_error(error):
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in RANGE_ERROR_MARKERS)
+
+
+class AdaptiveLogFetcher:
+    """
+    自适应get_logs拉取器。
+    - 节点返回范围过大或结果过多的错误时，将区块范围二分后重试
+    - 节点限流时按指数退避重试同一范围，不缩小窗口
+    - 结果稀疏时逐步扩大窗口，减少RPC调用次数
+    - 以异步生成器逐段产出事件，不一次性持有整个范围的结果
+    - event为AsyncWeb3合约事件，get_logs不阻塞事件循环
+    """
+
+    def __init__(self, name: str, event: Any):
+        self.name = name
+        self.event = event
+        self.min_span = 1
+        self.max_span = max(1, settings.LOG_FETCH_MAX_SPAN)
+        self.span = min(max(1, settings.LOG_FETCH_INITIAL_SPAN), self.max_span)
+        self.sparse_threshold = settings.LOG_FETCH_SPARSE_THRESHOLD
+        self.rate_limit_retries = settings.LOG_FETCH_RATE_LIMIT_RETRIES
+        self.backoff_base = settings.LOG_FETCH_BACKOFF_BASE
+        self.backoff_max = settings.LOG_FETCH_BACKOFF_MAX
+        # 出错后窗口不再超过二分后的大小，避免在扩大与二分之间反复震荡
+        self._ceiling = self.max_span
+        self._successes_since_error = 0
+
+    async def iter_events(self, from_block: int, to_block: int) -> AsyncIterator[Any]:
+        """按区块顺序逐个产出[from_block, to_block]范围内的事件"""
+        start = from_block
+        rate_limited = 0
+        while start <= to_block:
+            end = min(start + self.span - 1, to_block)
+            try:
+                events = await self.event.get_logs(from_block=start, to_block=end)
+            except Exception as e:
+                if is_rate_limit_error(e) and rate_limited < self.rate_limit_retries:
+                    delay = min(self.backoff_max, self.backoff_base * 2**rate_limited)
+                    rate_limited += 1
+                    logger.warning(
+                        f"[{self.name}] get_logs {start}-{end} rate limited, "
+                        f"retrying in {delay}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                if not is_range_error(e) or end == start:
+                    raise
+                self.span = max(self.min_span, (end - start + 1) // 2)
+                self._ceiling = self.span
+                self._successes_since_error = 0
+                logger.warning(
+                    f"[{self.name}] get_logs {start}-{end} rejected, "
+                    f"shrinking span to {self.span}: {e}"
+                )
+                continue
+
+            for event in events:
+                yield event
+
+            start = end + 1
+            rate_limited = 0
+            self._successes_since_error += 1
+            if self._successes_since_error >= 100:
+                # 长时间未再出错时放开上限，适应节点限制的变化
+                self._ceiling = self.max_span
+
+            # 结果稀疏时扩大窗口
+            if len(events) < self.sparse_threshold and self.span < self._ceiling:
+                self.span = min(self._ceiling, self.span * 2)
@@ -0,0 +1,25 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+
+def encode_cursor(created_at: datetime, token_id: Any) -> str:
+    """将(created_at, token_id)编码为不透明的分页游标"""
+    payload = json.dumps([created_at.isoformat(), token_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """
+    解析分页游标
+
+    Raises:
+        ValueError: 游标格式无效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, token_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), token_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
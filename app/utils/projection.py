@@ -0,0 +1,79 @@
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+# 列表接口可选择返回的字段
+LIST_FIELDS = (
+    "token_id",
+    "owner_address",
+    "content",
+    "evaluate_price",
+    "current_price",
+    "created_at",
+)
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    解析逗号分隔的字段列表，保持LIST_FIELDS中的顺序
+
+    Raises:
+        ValueError: 包含未知字段
+    """
+    if not fields:
+        return list(LIST_FIELDS)
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [field for field in LIST_FIELDS if field in requested]
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value) if value else None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+@lru_cache(maxsize=None)
+def _field_casts(
+    model: Type[BaseModel], fields: Tuple[str, ...]
+) -> Dict[str, Callable[[Any], Any]]:
+    """响应模型中声明为int或str的字段，数据库列类型可能与之不一致（如token_id）"""
+    casts = {}
+    for field in fields:
+        annotation = model.model_fields[field].annotation
+        if annotation in (int, str):
+            casts[field] = annotation
+    return casts
+
+
+def project_row(
+    row: Mapping[str, Any],
+    fields: Sequence[str],
+    preview: Optional[int] = None,
+    model: Optional[Type[BaseModel]] = None,
+) -> Dict[str, Any]:
+    """
+    将查询结果或响应模型的字段投影为可直接序列化的字典，不构建Pydantic模型
+
+    Args:
+        row: 字段名到值的映射
+        fields: 要保留的字段
+        preview: 内容预览长度；内存中的数据未在SQL中截断时在此截断
+        model: 响应模型；指定时按其字段类型转换值，与完整响应的类型保持一致
+    """
+    item = {field: _to_json_value(row[field]) for field in fields}
+    if model is not None:
+        for field, cast in _field_casts(model, tuple(fields)).items():
+            if item[field] is not None:
+                item[field] = cast(item[field])
+    if preview is not None and item.get("content") is not None:
+        item["content"] = item["content"][:preview]
+    return item
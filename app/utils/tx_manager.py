@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNonceManager:
+    """
+    本地nonce管理器，供基于AsyncWeb3的客户端使用。
+    - 首次分配时通过协程从链上获取pending nonce，之后在本地递增
+    - 交易发送失败或被丢弃时调用reset，下次分配时重新与链上同步
+    """
+
+    def __init__(self, fetch_nonce: Callable[[], Awaitable[int]]):
+        self._fetch_nonce = fetch_nonce
+        self._next_nonce: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    async def allocate(self) -> int:
+        """分配下一个可用nonce"""
+        async with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = await self._fetch_nonce()
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def reset(self):
+        """丢弃本地计数，下次分配时从链上重新同步"""
+        self._next_nonce = None
+
+
+class PriceCoalescer:
+    """
+    setPrice合并器。
+    - 同一窗口内同一token的多次价格变更只保留最后一次
+    - 窗口结束时drain出每个token的最终价格，统一提交
+    """
+
+    def __init__(self):
+        self._prices: Dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __contains__(self, token_id: Any) -> bool:
+        return token_id in self._prices
+
+    def add(self, token_id: Any, price: Any):
+        """记录token的最新价格，覆盖本窗口内之前的值"""
+        self._prices.pop(token_id, None)
+        self._prices[token_id] = price
+
+    def drain(self) -> Dict[Any, Any]:
+        """取出并清空本窗口内的最终价格"""
+        prices, self._prices = self._prices, {}
+        return prices
+
+
+@dataclass
+class PendingTransaction:
+    tx_hash: str
+    submitted_at: float
+    on_confirmed: Optional[Callable[[Any], Awaitable[None]]] = None
+    on_failed: Optional[Callable[[str], Awaitable[None]]] = None
+
+
+class ReceiptTracker:
+    """
+    后台交易回执跟踪器。
+    - 交易提交后立即返回，由跟踪器定期轮询回执
+    - 交易成功时调用on_confirmed，失败或超时时调用on_failed
+    """
+
+    def __init__(
+        self,
+        name: str,
+        w3_getter: Callable[[], AsyncWeb3],
+        poll_interval: float,
+        timeout: float,
+        on_timeout: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self._w3_getter = w3_getter
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._on_timeout = on_timeout
+        self._pending: Dict[str, PendingTransaction] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def track(
+        self,
+        tx_hash: str,
+        on_confirmed: Optional[Callable[[Any], Awaitable[None]]] = None,
+        on_failed: Optional[Callable[[str], Awaitable[None]]] = None,
+    ):
+        """登记一笔待确认交易"""
+        self._pending[tx_hash] = PendingTransaction(
+            tx_hash=tx_hash,
+            submitted_at=time.monotonic(),
+            on_confirmed=on_confirmed,
+            on_failed=on_failed,
+        )
+        if self._task is None or self._task.done():
+            self.start()
+
+    def start(self):
+        """启动后台轮询任务（需在事件循环中调用）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """停止后台轮询任务"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for pending in list(self._pending.values()):
+                try:
+                    await self._check(pending)
+                except Exception as e:
+                    logger.error(
+                        f"[{self.name}] Error checking receipt {pending.tx_hash}: {e}"
+                    )
+
+    async def _check(self, pending: PendingTransaction):
+        w3 = self._w3_getter()
+        try:
+            receipt = await w3.eth.get_transaction_receipt(pending.tx_hash)
+        except TransactionNotFound:
+            receipt = None
+
+        if receipt is None:
+            if time.monotonic() - pending.submitted_at > self.timeout:
+                # 超时的交易可能已被丢弃，其nonce需要重新同步
+                await self._fail(pending, "交易确认超时", resync_nonce=True)
+            return
+
+        if receipt.status == 0:
+            await self._fail(pending, "交易执行失败", resync_nonce=False)
+            return
+
+        self._pending.pop(pending.tx_hash, None)
+
+        logger.info(
+            f"[{self.name}] Transaction {pending.tx_hash} confirmed, "
+            f"gas used {receipt.gasUsed}"
+        )
+        if pending.on_confirmed:
+            await pending.on_confirmed(receipt)
+
+    async def _fail(self, pending: PendingTransaction, reason: str, resync_nonce: bool):
+        self._pending.pop(pending.tx_hash, None)
+        logger.error(f"[{self.name}] Transaction {pending.tx_hash} failed: {reason}")
+        if resync_nonce and self._on_timeout:
+            self._on_timeout()
+        if pending.on_failed:
+            await pending.on_failed(reason)
@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, nft, nft_polkadot
+from app.routers import auth, feed, nft, nft_multichain, nft_polkadot
 from app.database import create_tables, test_connection
-from app.utils.event_listener import event_listener
-from app.utils.polkadot_listener import polkadot_event_listener
+from app.utils.chain_indexer import indexer_scheduler
+from app.utils.evaluate import close_http_session
+from app.utils.evm_client import close_rpc_session
+from app.utils.leaderboard import nft_leaderboard, nft_polkadot_leaderboard
+from app.utils.leader_election import leader_elector
 
 import uvicorn
-import asyncio
 
 
 # 创建FastAPI应用实例
@@ -19,6 +21,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 分页游标通过响应头返回，跨域请求需要显式暴露
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -32,24 +36,26 @@ async def startup_event():
     else:
         print("Failed to connect to database!")
 
-    # 启动事件监听器
+    # 加载价格排行榜；失败时在首次请求时重试
     try:
-        event_listener.initialize()
-        polkadot_event_listener.initialize()
-        asyncio.create_task(event_listener.start_listening())
-        asyncio.create_task(polkadot_event_listener.start_listening())
-        print("Event listener started successfully!")
+        await nft_leaderboard.load()
+        await nft_polkadot_leaderboard.load()
     except Exception as e:
-        print(f"Failed to start event listener: {e}")
+        print(f"Failed to load price leaderboard: {e}")
+
+    # 多进程部署时只有选举出的领导者进程运行所有链的索引器
+    leader_elector.start(
+        on_elected=indexer_scheduler.start, on_revoked=indexer_scheduler.stop
+    )
 
 
 # 关闭时停止事件监听器
 @app.on_event("shutdown")
 async def shutdown_event():
     print("Shutting down MoonCL Server...")
-    event_listener.stop_listening()
-    polkadot_event_listener.stop_listening()
-    print("Event listener stopped")
+    await leader_elector.stop()
+    await close_http_session()
+    await close_rpc_session()
 
 
 # 注册路由 - 移除opinion路由
@@ -58,6 +64,10 @@ app.include_router(nft.router, prefix="/api/v1/nfts", tags=["nfts"])
 app.include_router(
     nft_polkadot.router, prefix="/api/v1/nfts/polkadot", tags=["nfts_polkadot"]
 )
+app.include_router(
+    nft_multichain.router, prefix="/api/v1/nfts/all", tags=["nfts_multichain"]
+)
+app.include_router(feed.router, prefix="/api/v1/feed", tags=["feed"])
 
 
 # 根路径
@@ -0,0 +1,4 @@
+-- 为已存在的实时推送事件表补充变更前所有者列，bought事件同时推送给卖方
+-- create_tables不会为已存在的表添加列，升级已有数据库时执行本脚本
+ALTER TABLE `nft_feed_event`
+  ADD COLUMN `previous_owner` varchar(255) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '变更前的所有者' AFTER `owner_address`;
@@ -0,0 +1,9 @@
+-- 为已存在的NFT表补充排行榜与按所有者分页使用的索引
+-- nft.sql会重建表，create_tables也不会为已存在的表添加索引，升级已有数据库时执行本脚本
+ALTER TABLE `nft`
+  ADD KEY `idx_current_price` (`current_price`),
+  ADD KEY `idx_owner_created_token` (`owner_address`, `created_at`, `token_id`);
+
+ALTER TABLE `nft_polkadot`
+  ADD KEY `idx_current_price` (`current_price`),
+  ADD KEY `idx_owner_created_token` (`owner_address`, `created_at`, `token_id`);
@@ -10,5 +10,43 @@ CREATE TABLE `nft` (
   `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
   PRIMARY KEY (`token_id`),
   KEY `idx_owner_address` (`owner_address`),
-  KEY `idx_created_at` (`created_at`)
+  KEY `idx_created_at` (`created_at`),
+  KEY `idx_current_price` (`current_price`),
+  KEY `idx_owner_created_token` (`owner_address`, `created_at`, `token_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='NFT表';
+
+-- 区块监听进度表
+DROP TABLE IF EXISTS `block_checkpoint`;
+CREATE TABLE `block_checkpoint` (
+  `chain` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '链标识',
+  `contract_address` varchar(255) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '合约地址',
+  `last_block` bigint NOT NULL COMMENT '已处理的最后区块',
+  `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (`chain`, `contract_address`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='区块监听进度表';
+
+-- 内容估价缓存表
+DROP TABLE IF EXISTS `evaluation_cache`;
+CREATE TABLE `evaluation_cache` (
+  `content_hash` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '规范化内容SHA-256',
+  `model_version` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '估价模型版本',
+  `price` decimal(20,8) NOT NULL COMMENT '估价结果(ETH)',
+  `expires_at` datetime NOT NULL COMMENT '过期时间',
+  `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+  PRIMARY KEY (`content_hash`, `model_version`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='内容估价缓存表';
+
+-- 实时推送事件表
+DROP TABLE IF EXISTS `nft_feed_event`;
+CREATE TABLE `nft_feed_event` (
+  `id` bigint NOT NULL AUTO_INCREMENT COMMENT '事件ID',
+  `chain` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '链标识',
+  `event_type` varchar(32) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '事件类型',
+  `token_id` varchar(255) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT 'Token ID',
+  `owner_address` varchar(255) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '所有者地址',
+  `previous_owner` varchar(255) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '变更前的所有者',
+  `current_price` decimal(20,12) DEFAULT NULL COMMENT '当前价格',
+  `created_at` datetime NOT NULL COMMENT '创建时间',
+  PRIMARY KEY (`id`),
+  KEY `idx_created_at` (`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='实时推送事件表';